@@ -0,0 +1,291 @@
+"""
+Безголовый замер производительности игровой сцены.
+
+Запускает Game с SDL-драйверами dummy (без окна и звука), сразу переходит в GameScene,
+ведёт игрока по заранее заданной последовательности клавиш и выводит JSON
+с перцентилями времени кадра, разделением update/render и пиковой памятью.
+
+    python benchmark.py --suite > before.json
+    python benchmark.py --map 250 --trees 2000 --characters 100 --resolution 1920x1080
+"""
+import argparse
+import contextlib
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+import settings
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Сценарий ввода игрока: (число кадров, зажатые клавиши), повторяется по кругу
+INPUT_SCRIPT = [
+    (90, {pygame.K_d}),
+    (60, {pygame.K_d, pygame.K_s}),
+    (90, {pygame.K_s}),
+    (30, set()),
+    (90, {pygame.K_a}),
+    (60, {pygame.K_w, pygame.K_a}),
+    (90, {pygame.K_w}),
+    (30, set()),
+]
+
+# Стандартная матрица для --suite
+SUITE_MAP_SIZES = [60, 250, 1000]
+SUITE_TREES = [0, 1000, 10000]
+SUITE_CHARACTERS = [1, 50, 200]
+SUITE_RESOLUTIONS = [(1280, 720), (1920, 1080)]
+
+
+class ScriptedInput:
+    """Отправляет KEYDOWN/KEYUP так, будто игрок нажимает клавиши по INPUT_SCRIPT"""
+
+    def __init__(self, script):
+        self.script = script
+        self.index = 0
+        self.frames_left = script[0][0]
+        self.pressed = set()
+        self._apply(script[0][1])
+
+    def _apply(self, keys):
+        for key in self.pressed - keys:
+            pygame.event.post(pygame.event.Event(pygame.KEYUP, key=key))
+        for key in keys - self.pressed:
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key))
+        self.pressed = set(keys)
+
+    def step(self):
+        self.frames_left -= 1
+        if self.frames_left <= 0:
+            self.index = (self.index + 1) % len(self.script)
+            self.frames_left, keys = self.script[self.index]
+            self._apply(keys)
+
+
+def percentiles(values, points=(50, 90, 95, 99)):
+    ordered = sorted(values)
+    if not ordered:
+        return {}
+    result = {f"p{p}": ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] for p in points}
+    result["mean"] = sum(ordered) / len(ordered)
+    result["max"] = ordered[-1]
+    return {name: round(value * 1000, 3) for name, value in result.items()}
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    # ru_maxrss: килобайты в Linux, байты в macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak /= 1024
+    return round(peak / 1024, 1)
+
+
+def populate(scene, trees: int, characters: int, rng: random.Random):
+    """Добавляет в мир сцены деревья и NPC в случайных проходимых клетках"""
+    from game_objects.player import Player, Tree
+
+    world = scene.world
+    for _ in range(trees):
+        row, col = rng.randrange(world.rows), rng.randrange(world.cols)
+        if world.get_static_object(row, col) is None:
+            world.add_static_object(Tree(), row, col)
+
+    npcs = []
+    for _ in range(max(0, characters - 1)):
+        npc = Player(world)
+        world.add_dinamic_object(npc, rng.randrange(world.rows), rng.randrange(world.cols))
+        npcs.append(npc)
+    return npcs
+
+
+def drive_npcs(npcs, frame: int, rng: random.Random):
+    """Раз в секунду каждый NPC выбирает новое направление или останавливается"""
+    from game_objects.component_transform import Direction
+
+    for i, npc in enumerate(npcs):
+        if (frame + i) % 60:
+            continue
+        controller = npc.get_component("controller")
+        if rng.random() < 0.2:
+            controller.stop()
+        else:
+            controller.set_direction(rng.choice(list(Direction)))
+            controller.move()
+
+
+class PhaseTimer:
+    """Подменяет методы update и render у Game и суммирует их время за кадр"""
+
+    def __init__(self, game):
+        self.times = {"update": 0.0, "render": 0.0}
+        game.update = self._wrap("update", game.update)
+        game.render = self._wrap("render", game.render)
+
+    def _wrap(self, name, method):
+        def timed(*args):
+            start = time.perf_counter()
+            method(*args)
+            self.times[name] += time.perf_counter() - start
+        return timed
+
+    def reset(self):
+        for name in self.times:
+            self.times[name] = 0.0
+
+
+def run_scenario(map_size: int, trees: int, characters: int, resolution, frames: int, warmup: int,
+                 seed: int, trace_memory: bool, streaming: bool = False) -> dict:
+    settings.screen_width, settings.screen_height = resolution
+    rng = random.Random(seed)
+    random.seed(seed)
+
+    from game import Game
+    from scenes.scene_game import GameScene
+
+    if trace_memory:
+        tracemalloc.start()
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        game = Game(*resolution, name="Benchmark")
+        scene = GameScene(game.scene_manager, map_size=(map_size, map_size), streaming=streaming)
+        game.scene_manager.register_scene(scene)
+        npcs = populate(scene, trees, characters, rng)
+        game.scene_manager.change_scene(scene.name)
+        setup_time = time.perf_counter() - start
+
+        dt = 1 / settings.fps
+        script = ScriptedInput(INPUT_SCRIPT)
+        phases = PhaseTimer(game)
+        frame_times, update_times, render_times = [], [], []
+        for frame in range(warmup + frames):
+            script.step()
+            drive_npcs(npcs, frame, rng)
+
+            # Кадр целиком, как в Game.run: загрузчик, звук, события, шаги симуляции и отрисовка
+            phases.reset()
+            frame_start = time.perf_counter()
+            game.step_frame(dt)
+            frame_end = time.perf_counter()
+
+            if frame >= warmup:
+                frame_times.append(frame_end - frame_start)
+                update_times.append(phases.times["update"])
+                render_times.append(phases.times["render"])
+
+    result = {
+        "map_size": map_size,
+        "trees": len(scene.world.all_static_objects),
+        "characters": len(scene.world.all_dynamic_objects),
+        "resolution": f"{resolution[0]}x{resolution[1]}",
+        "streaming": streaming,
+        "frames": frames,
+        "setup_s": round(setup_time, 3),
+        "frame_ms": percentiles(frame_times),
+        "update_ms": percentiles(update_times),
+        "render_ms": percentiles(render_times),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    if trace_memory:
+        result["peak_python_mb"] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 1)
+        tracemalloc.stop()
+
+    pygame.quit()
+    return result
+
+
+def run_in_subprocess(map_size: int, trees: int, characters: int, resolution, args) -> dict:
+    command = [sys.executable, os.path.abspath(__file__),
+               "--map", str(map_size), "--trees", str(trees), "--characters", str(characters),
+               "--resolution", f"{resolution[0]}x{resolution[1]}",
+               "--frames", str(args.frames), "--warmup", str(args.warmup), "--seed", str(args.seed)]
+    if args.trace_memory:
+        command.append("--trace-memory")
+    if args.streaming:
+        command.append("--streaming")
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output)["scenarios"][0]
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_resolution(text: str):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Безголовый замер производительности GameScene")
+    parser.add_argument("--map", type=int, default=60, help="сторона карты в тайлах")
+    parser.add_argument("--trees", type=int, default=100, help="число деревьев")
+    parser.add_argument("--characters", type=int, default=1, help="число персонажей вместе с игроком")
+    parser.add_argument("--resolution", type=parse_resolution, default=(1920, 1080), help="например 1920x1080")
+    parser.add_argument("--frames", type=int, default=600, help="число измеряемых кадров")
+    parser.add_argument("--warmup", type=int, default=60, help="кадры прогрева, не входят в результат")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--suite", action="store_true", help="прогнать стандартную матрицу сценариев")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="дополнительно замерить пик памяти Python через tracemalloc (замедляет)")
+    parser.add_argument("--streaming", action="store_true",
+                        help="чанковый мир: в памяти только чанки вокруг камеры, --map - сторона мира")
+    parser.add_argument("--output", help="файл для JSON, по умолчанию stdout")
+    args = parser.parse_args()
+
+    if args.suite:
+        scenarios = list(itertools.product(SUITE_MAP_SIZES, SUITE_TREES, SUITE_CHARACTERS, SUITE_RESOLUTIONS))
+    else:
+        scenarios = [(args.map, args.trees, args.characters, args.resolution)]
+
+    results = []
+    for map_size, trees, characters, resolution in scenarios:
+        print(f"map {map_size} trees {trees} characters {characters} {resolution[0]}x{resolution[1]}",
+              file=sys.stderr)
+        if len(scenarios) == 1:
+            results.append(run_scenario(map_size, trees, characters, resolution,
+                                        args.frames, args.warmup, args.seed, args.trace_memory,
+                                        args.streaming))
+        else:
+            # Каждый сценарий в отдельном процессе: кэши и пик памяти не переходят между прогонами
+            results.append(run_in_subprocess(map_size, trees, characters, resolution, args))
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "scenarios": results,
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text)
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,49 +1,143 @@
 import sys
+from enum import Enum
+from time import perf_counter
+from typing import Optional
+
 import pygame
 
+import settings
+from managers.mngaudio import audio_manager
+from managers.mngloader import asset_loader
+from managers.mngprofiler import profiler
 from scenes.manager import SceneManager
 
 
+class FramePacing(Enum):
+    """Способ ограничения частоты кадров"""
+    TICK = "tick"  # clock.tick(fps) - экономит процессор, но с джиттером
+    UNCAPPED = "uncapped"  # без ограничения
+    VSYNC = "vsync"  # ограничивает вертикальная синхронизация
+    BUSY_LOOP = "busy_loop"  # clock.tick_busy_loop(fps) - точный, для замеров
+
+
 class Game:
-    def __init__(self, width=800, height=600, name="Лесник"):
+    PROFILER_KEY = pygame.K_F3  # показать/скрыть профилировщик
+
+    def __init__(self, width=800, height=600, name="Лесник",
+                 fixed_timestep: Optional[float] = settings.fixed_timestep,
+                 frame_pacing: str = settings.frame_pacing,
+                 fps: int = settings.fps):
         pygame.init()
         pygame.mixer.init()
-        self.screen = pygame.display.set_mode((width, height))
+        self.frame_pacing = FramePacing(frame_pacing)
+        self.fps = fps
+        self.screen = self._create_screen(width, height)
         pygame.display.set_caption(name)
         self.clock = pygame.time.Clock()
         self.running = True
+
+        # Фиксированный шаг симуляции; None - шаг равен времени кадра
+        self.fixed_timestep = fixed_timestep
+        self.max_catch_up_steps = settings.max_catch_up_steps
+        self._accumulator = 0.0
+
         self.scene_manager = SceneManager(self)
         self.scene_manager.change_scene("Main menu")
 
         self.dt = 0
 
+    def _create_screen(self, width, height) -> pygame.Surface:
+        if self.frame_pacing == FramePacing.VSYNC:
+            try:
+                return pygame.display.set_mode((width, height), pygame.SCALED, vsync=1)
+            except pygame.error as e:
+                print(f"Вертикальная синхронизация недоступна: {e}")
+                self.frame_pacing = FramePacing.UNCAPPED
+        return pygame.display.set_mode((width, height))
+
     def on_close(self):
         self.running = False
 
+    def tick(self) -> float:
+        """Ждёт следующий кадр согласно frame_pacing, возвращает время кадра в секундах"""
+        if self.frame_pacing == FramePacing.TICK:
+            return self.clock.tick(self.fps) / 1000
+        if self.frame_pacing == FramePacing.BUSY_LOOP:
+            return self.clock.tick_busy_loop(self.fps) / 1000
+        return self.clock.tick() / 1000
+
     def run(self):
         while self.running:
-            dt = self.clock.tick(60) / 1000
+            self.step_frame(self.tick())
+        self.cleanup()
+
+    def step_frame(self, frame_time: float):
+        """Один кадр: события, шаги симуляции и отрисовка"""
+        self.dt = frame_time
+        # Конец кадра по бюджету fps: остаток после отрисовки отдаётся фоновой подготовке сцен
+        deadline = perf_counter() + 1 / (self.fps or settings.fps)
+        profiler.begin_frame()
+        with profiler.measure("AssetLoader.update"):
+            asset_loader.update()
+        audio_manager.update()
+        with profiler.measure("Game.handle_events"):
             self.handle_events()
-            self.update(dt)
+
+        if self.fixed_timestep is None:
+            self.update(frame_time)
             self.render()
-        self.cleanup()
+        else:
+            self._accumulator += frame_time
+            steps = 0
+            while self._accumulator >= self.fixed_timestep and steps < self.max_catch_up_steps:
+                self.update(self.fixed_timestep)
+                self._accumulator -= self.fixed_timestep
+                steps += 1
+            if steps == self.max_catch_up_steps:
+                # Не догоняем бесконечно: отбрасываем отставание больше одного шага
+                self._accumulator = min(self._accumulator, self.fixed_timestep)
+
+            self.render(self._accumulator / self.fixed_timestep)
+
+        with profiler.measure("SceneManager.prewarm"):
+            self.scene_manager.update_prewarming(deadline)
+        profiler.end_frame()
 
     def update(self, dt):
-        self.scene_manager.current_scene.update(dt)
+        scene = self.scene_manager.current_scene
+        with profiler.measure(f"Game.update [{scene.name}]"):
+            self.scene_manager.update(dt)
 
     def handle_events(self):
         #метод обработки событий
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.on_close()
+            if event.type == pygame.KEYDOWN and event.key == self.PROFILER_KEY:
+                profiler.toggle()
+                continue
             self.scene_manager.current_scene.handle_events(event)
 
-    def render(self):
+    def render(self, alpha: float = 1.0):
         #метод отрисовки игровых объектов
-        self.screen.fill((0, 0, 0))
-        self.scene_manager.current_scene.render(self.screen)
+        scene = self.scene_manager.current_scene
+        scene.interpolation_alpha = alpha
+        # Оверлей профилировщика меняется каждый кадр - с ним рисуем экран целиком
+        if scene.use_dirty_rects and not profiler.enabled:
+            with profiler.measure(f"Game.render [{scene.name}]"):
+                rects = scene.render_dirty(self.screen)
+            if rects:
+                pygame.display.update(rects)
+            return
+
+        with profiler.measure(f"Game.render [{scene.name}]"):
+            self.screen.fill((0, 0, 0))
+            scene.render(self.screen)
+        profiler.render(self.screen)
         pygame.display.flip()
+        scene.invalidate()
 
     def cleanup(self):
+        asset_loader.shutdown()
         pygame.quit()
         sys.exit()
@@ -0,0 +1,64 @@
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple
+
+import pygame
+
+from game_objects.component_transform import Direction
+from game_objects.movement_state import MovementState
+from game_objects.sprite_atlas import SpriteAtlas
+
+
+class AnimationClip:
+    """Неизменяемый клип одного состояния: кадры по направлениям и длительность кадра"""
+
+    def __init__(self, state: MovementState,
+                 frames: Dict[Direction, Tuple[Tuple[pygame.Surface, int, pygame.math.Vector2], ...]],
+                 frame_duration: float, loop: bool = True):
+        self.state = state
+        self.frames: Mapping[Direction, tuple] = MappingProxyType(frames)
+        self.frame_duration = frame_duration
+        self.loop = loop
+        if Direction.S in frames:
+            self.frames_number = len(frames[Direction.S])
+        else:
+            self.frames_number = max((len(direction_frames) for direction_frames in frames.values()), default=0)
+
+
+class AnimationLibrary:
+    """
+    Общая для процесса библиотека клипов, ключ - папка с кадрами персонажа.
+    Кадры загружаются один раз, компоненты хранят только своё состояние проигрывания.
+    """
+
+    # Длительность кадра по состоянию, секунды
+    FRAME_DURATIONS = {
+        MovementState.WALK: 0.1333,
+        MovementState.IDLE: 0.45,
+    }
+    DEFAULT_FRAME_DURATION = 0.1333
+
+    def __init__(self):
+        self._clips: Dict[str, Mapping[MovementState, AnimationClip]] = {}
+
+    def get(self, path: str) -> Mapping[MovementState, AnimationClip]:
+        clips = self._clips.get(path)
+        if clips is None:
+            clips = MappingProxyType(self._load(path))
+            self._clips[path] = clips
+        return clips
+
+    def unload(self, path: str):
+        self._clips.pop(path, None)
+
+    def _load(self, path: str) -> Dict[MovementState, AnimationClip]:
+        frames_by_state: Dict[MovementState, Dict[Direction, tuple]] = {}
+        for (animation_state, direction), frames in SpriteAtlas.load(path).frame_surfaces().items():
+            state = MovementState(animation_state)
+            frames_by_state.setdefault(state, {})[Direction(direction)] = tuple(frames)
+
+        return {state: AnimationClip(state, frames,
+                                     self.FRAME_DURATIONS.get(state, self.DEFAULT_FRAME_DURATION))
+                for state, frames in frames_by_state.items()}
+
+
+animation_library = AnimationLibrary()
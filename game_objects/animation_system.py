@@ -0,0 +1,121 @@
+from typing import List
+
+import numpy as np
+
+from game_objects.frame_sequence import FrameSequence
+
+
+class AnimationSystem:
+    """
+    Пакетные часы анимаций: состояние всех активных FrameSequence лежит в массивах NumPy
+    и продвигается одним векторным шагом за тик, вместо update() у каждого объекта.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.elapsed = np.zeros(capacity, dtype=np.float64)
+        self.frame_duration = np.ones(capacity, dtype=np.float64)
+        self.frames_number = np.ones(capacity, dtype=np.int32)
+        self.current = np.zeros(capacity, dtype=np.int32)
+        self.loop = np.zeros(capacity, dtype=bool)
+        self.playing = np.zeros(capacity, dtype=bool)
+
+        self._free: List[int] = list(range(capacity - 1, -1, -1))
+
+    @property
+    def capacity(self) -> int:
+        return len(self.elapsed)
+
+    @property
+    def active_count(self) -> int:
+        return self.capacity - len(self._free)
+
+    def allocate(self, frames_number: int, frame_duration: float, loop: bool) -> int:
+        if not self._free:
+            self._grow()
+        slot = self._free.pop()
+        self.elapsed[slot] = 0.0
+        self.frame_duration[slot] = frame_duration
+        self.frames_number[slot] = max(1, frames_number)
+        self.current[slot] = 0
+        self.loop[slot] = loop
+        self.playing[slot] = False
+        return slot
+
+    def release(self, slot: int):
+        self.playing[slot] = False
+        self._free.append(slot)
+
+    def update(self, dt: float):
+        """Тот же шаг, что FrameSequence.update, для всех последовательностей сразу"""
+        playing = self.playing
+        self.elapsed[playing] += dt
+
+        advance = playing & (self.elapsed >= self.frame_duration)
+        self.elapsed[advance] -= self.frame_duration[advance]
+        self.current[advance] += 1
+
+        finished = advance & (self.current >= self.frames_number)
+        self.current[finished & self.loop] = 0
+        stopped = finished & ~self.loop
+        self.current[stopped] -= 1
+        self.playing[stopped] = False
+
+    def _grow(self):
+        old_capacity = self.capacity
+        new_capacity = old_capacity * 2
+        for name, fill in (("elapsed", 0.0), ("frame_duration", 1.0), ("frames_number", 1),
+                           ("current", 0), ("loop", False), ("playing", False)):
+            old = getattr(self, name)
+            new = np.full(new_capacity, fill, dtype=old.dtype)
+            new[:old_capacity] = old
+            setattr(self, name, new)
+        self._free.extend(range(new_capacity - 1, old_capacity - 1, -1))
+
+
+animation_system = AnimationSystem()
+
+
+class BatchedFrameSequence(FrameSequence):
+    """
+    FrameSequence, чьё состояние хранится в AnimationSystem.
+    update() ничего не делает - последовательность продвигает AnimationSystem.update().
+    """
+
+    def __init__(self, animation_name, frames_number: int, frame_duration, loop=True,
+                 system: AnimationSystem = animation_system):
+        self.system = system
+        self.slot = system.allocate(frames_number, frame_duration, loop)
+        super().__init__(animation_name, frames_number, frame_duration, loop)
+
+    @property
+    def current_frame_index(self) -> int:
+        return int(self.system.current[self.slot])
+
+    @current_frame_index.setter
+    def current_frame_index(self, value: int):
+        self.system.current[self.slot] = value
+
+    @property
+    def elapsed_time(self) -> float:
+        return float(self.system.elapsed[self.slot])
+
+    @elapsed_time.setter
+    def elapsed_time(self, value: float):
+        self.system.elapsed[self.slot] = value
+
+    @property
+    def is_playing(self) -> bool:
+        return bool(self.system.playing[self.slot])
+
+    @is_playing.setter
+    def is_playing(self, value: bool):
+        self.system.playing[self.slot] = value
+
+    def update(self, dt):
+        pass
+
+    def release(self):
+        """Освобождает слот в AnimationSystem"""
+        if self.slot is not None:
+            self.system.release(self.slot)
+            self.slot = None
@@ -35,6 +35,16 @@ class Camera:
             )
             self.offset = world_pos - screen_center
 
+    def get_render_offset(self) -> pygame.math.Vector2:
+        """Смещение камеры для отрисовки с учётом интерполяции позиции цели"""
+        if self.target:
+            screen_center = pygame.math.Vector2(
+                settings.screen_width // 2,
+                settings.screen_height // 2
+            )
+            return self.target.get_render_position() - screen_center
+        return self.offset
+
     def update_position(self):
         if self.target:
             world_offset = transform.get_screen_position()
@@ -0,0 +1,457 @@
+import random
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import perf_counter
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.random import default_rng
+
+import utils
+from game_objects.camera import Camera
+from game_objects.gobject import GameObject
+from game_objects.ground import Map
+from managers.mngprofiler import profiler
+
+ChunkKey = Tuple[int, int]
+# (фабрика объекта, row, col) в координатах мира
+Placement = Tuple[Callable[[], GameObject], int, int]
+
+
+class ChunkData:
+    """Содержимое чанка мира без игровых объектов: тайлы и расстановка статических объектов"""
+
+    def __init__(self, tile_grid: np.ndarray, placements: Optional[List[Placement]] = None):
+        self.tile_grid = tile_grid
+        self.placements: List[Placement] = placements if placements is not None else []
+        # Чанк менялся после генерации: при выгрузке его нужно сохранить, а не генерировать заново
+        self.modified = False
+
+
+class WorldChunk:
+    """Загруженный чанк: сетки его клеток и живые статические объекты"""
+
+    def __init__(self, key: ChunkKey, row_start: int, col_start: int, data: ChunkData):
+        self.key = key
+        self.row_start = row_start
+        self.col_start = col_start
+        self.data = data
+        shape = data.tile_grid.shape
+        self.walk_grid: np.ndarray = np.ones(shape, dtype=np.float32)
+        # Номер объекта в self.objects, -1 - клетка пуста
+        self.static_grid: np.ndarray = np.full(shape, -1, dtype=np.int32)
+        self.objects: List[GameObject] = []
+        # Непроходимые области объектов чанка, могут заходить в соседние чанки
+        self.footprints: List[Tuple[int, int, int, int]] = []
+
+    @property
+    def tile_grid(self) -> np.ndarray:
+        return self.data.tile_grid
+
+
+class ChunkedMap(Map):
+    """
+    Карта, разбитая на чанки chunk_size x chunk_size клеток. В памяти держатся только чанки
+    в радиусе view_radius чанков от цели камеры: недостающие генерируются в фоновом потоке
+    с упреждением по направлению движения, отставшие выгружаются вместе со своими объектами.
+    Чанк генерируется детерминированно из seed и своих координат, поэтому при выгрузке
+    сохраняются только изменённые чанки. Клетки незагруженных чанков непроходимы и не рисуются.
+    Общих для всей карты сеток (tile_grid, walk_grid, static_grid) у этой карты нет.
+
+    Для сохранения это не Map: мир размером в миллиарды клеток не помещается в файл уровня,
+    поэтому persistent = False, а save и load отклоняются с ValueError. Перед сохранением
+    карты проверяйте map.persistent.
+    """
+
+    persistent = False
+
+    def __init__(self, rows, cols, tile_size: tuple = (256, 128), chunk_size: int = 16, view_radius: int = 2,
+                 scatter_objects: Sequence[Tuple[Callable[[], GameObject], float]] = (),
+                 seed: Optional[int] = None, activate_budget: float = 0.002):
+        self.chunk_size = chunk_size
+        self.view_radius = view_radius
+        # На сколько чанков вперёд по направлению движения подгружать мир
+        self.lookahead = 1
+        # Объекты, которые генератор рассыпает по чанку: (фабрика, доля клеток)
+        self.scatter_objects = list(scatter_objects)
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.activate_budget = activate_budget
+
+        self.tile_dtype = np.uint8
+        self._tile_range = (0, 0)
+        # Увеличивается при перегенерации мира, устаревшие результаты фонового потока отбрасываются
+        self._generation = 0
+
+        self._chunks: Dict[ChunkKey, WorldChunk] = {}
+        self._saved: Dict[ChunkKey, ChunkData] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Запрошенные чанки; None - чанк берётся из сохранённых, без фонового потока
+        self._pending: Dict[ChunkKey, Optional[Future]] = {}
+        # Готовые результаты фонового потока: (ключ, поколение, данные, ошибка)
+        self._ready: Deque[tuple] = deque()
+
+        self.camera: Optional[Camera] = None
+        self._focus: Optional[Tuple[float, float]] = None
+        self._heading: Tuple[int, int] = (0, 0)
+
+        super().__init__(rows, cols, tile_size)
+
+    def _create_grids(self, level=None):
+        # Сетки клеток живут в чанках
+        pass
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'Map':
+        raise ValueError(f"Чанковый мир не открывается из файла уровня {path}, используйте Map.load")
+
+    def save(self, path: str):
+        raise ValueError(f"Чанковый мир не сохраняется в файл уровня {path} (persistent = False)")
+
+    @property
+    def chunk_rows(self) -> int:
+        return (self.rows + self.chunk_size - 1) // self.chunk_size
+
+    @property
+    def chunk_cols(self) -> int:
+        return (self.cols + self.chunk_size - 1) // self.chunk_size
+
+    @property
+    def resident_chunks(self) -> int:
+        return len(self._chunks)
+
+    def chunk_of(self, row: int, col: int) -> ChunkKey:
+        return row // self.chunk_size, col // self.chunk_size
+
+    def chunk_tiles(self, chunk_row: int, chunk_col: int) -> Tuple[int, int, int, int]:
+        """Диапазон клеток чанка: (row_start, col_start, row_end, col_end), конец не включается"""
+        r0 = chunk_row * self.chunk_size
+        c0 = chunk_col * self.chunk_size
+        return r0, c0, min(self.rows, r0 + self.chunk_size), min(self.cols, c0 + self.chunk_size)
+
+    def _chunks_in(self, row_start: int, col_start: int, row_end: int, col_end: int):
+        chunk_r0, chunk_c0 = self.chunk_of(max(0, row_start), max(0, col_start))
+        chunk_r1, chunk_c1 = self.chunk_of(min(self.rows, row_end) - 1, min(self.cols, col_end) - 1)
+        for chunk_row in range(chunk_r0, chunk_r1 + 1):
+            for chunk_col in range(chunk_c0, chunk_c1 + 1):
+                yield chunk_row, chunk_col
+
+    def _chunk_at(self, row: int, col: int) -> Optional[WorldChunk]:
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return None
+        return self._chunks.get((row // self.chunk_size, col // self.chunk_size))
+
+    def is_loaded(self, row_start: int, col_start: int, row_end: int, col_end: int) -> bool:
+        return all(key in self._chunks for key in self._chunks_in(row_start, col_start, row_end, col_end))
+
+    def is_walkable(self, row: int, col: int) -> bool:
+        chunk = self._chunk_at(row, col)
+        if chunk is None:
+            return False  # за границей карты или чанк не загружен
+        return chunk.walk_grid[row - chunk.row_start, col - chunk.col_start] != 0
+
+    def walkable_mask(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        rows = np.asarray(rows)
+        cols = np.asarray(cols)
+        inside = (rows >= 0) & (rows < self.rows) & (cols >= 0) & (cols < self.cols)
+        result = np.zeros(inside.shape, dtype=bool)
+        chunk_rows = rows // self.chunk_size
+        chunk_cols = cols // self.chunk_size
+        for key in set(zip(chunk_rows[inside].tolist(), chunk_cols[inside].tolist())):
+            chunk = self._chunks.get(key)
+            if chunk is None:
+                continue
+            selected = inside & (chunk_rows == key[0]) & (chunk_cols == key[1])
+            result[selected] = chunk.walk_grid[rows[selected] - chunk.row_start,
+                                               cols[selected] - chunk.col_start] != 0
+        return result
+
+    def get_static_object(self, row: int, col: int) -> Optional[GameObject]:
+        chunk = self._chunk_at(row, col)
+        if chunk is None:
+            return None
+        handle = chunk.static_grid[row - chunk.row_start, col - chunk.col_start]
+        return chunk.objects[handle] if handle >= 0 else None
+
+    def add_static_object(self, game_object: GameObject, row: int, col: int):
+        """
+        Ставит объект и запоминает его в расстановке чанка, чтобы после выгрузки чанка
+        объект был создан заново вызовом type(game_object)(). Незагруженный чанк загружается сразу.
+        Объект, который уже стоял в клетке, уничтожается и из расстановки убирается.
+        """
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return
+
+        if game_object.get_component("transform"):
+            chunk = self._require_chunk(row, col)
+            placements = chunk.data.placements
+            if chunk.static_grid[row - chunk.row_start, col - chunk.col_start] >= 0:
+                placements[:] = [placement for placement in placements if placement[1:] != (row, col)]
+            placements.append((type(game_object), row, col))
+            chunk.data.modified = True
+            self._place(chunk, game_object, row, col)
+
+    def set_tile(self, x: int, y: int, tile_id: int):
+        if 0 <= x < self.cols and 0 <= y < self.rows:
+            chunk = self._require_chunk(y, x)
+            local = (y - chunk.row_start, x - chunk.col_start)
+            if chunk.tile_grid[local] != tile_id:
+                chunk.tile_grid[local] = tile_id
+                chunk.data.modified = True
+                self.chunk_cache.invalidate(y, x)
+
+    def get_tile(self, x: int, y: int) -> int:
+        chunk = self._chunk_at(y, x)
+        if chunk is None:
+            return 0
+        return int(chunk.tile_grid[y - chunk.row_start, x - chunk.col_start])
+
+    def get_region(self, row_start: int, col_start: int, row_end: int, col_end: int) -> np.ndarray:
+        """Копия прямоугольника тайлов, обрезанного по границам карты; незагруженные клетки - 0"""
+        row_start, col_start = max(0, row_start), max(0, col_start)
+        row_end, col_end = min(self.rows, row_end), min(self.cols, col_end)
+        region = np.zeros((max(0, row_end - row_start), max(0, col_end - col_start)), dtype=self.tile_dtype)
+        if not region.size:
+            return region
+        for key in self._chunks_in(row_start, col_start, row_end, col_end):
+            chunk = self._chunks.get(key)
+            if chunk is None:
+                continue
+            r0, c0 = max(row_start, chunk.row_start), max(col_start, chunk.col_start)
+            r1, c1 = self.chunk_tiles(*key)[2:]
+            r1, c1 = min(row_end, r1), min(col_end, c1)
+            region[r0 - row_start:r1 - row_start, c0 - col_start:c1 - col_start] = \
+                chunk.tile_grid[r0 - chunk.row_start:r1 - chunk.row_start, c0 - chunk.col_start:c1 - chunk.col_start]
+        return region
+
+    def fill_random_grid(self, min_range_val: int, max_range_val: int):
+        """Перегенерирует мир с новым диапазоном тайлов; изменения чанков при этом сбрасываются"""
+        self._tile_range = (min_range_val, max_range_val)
+        self._generation += 1
+        self._cancel_pending()
+        for chunk in list(self._chunks.values()):
+            self._deactivate(chunk, save=False)
+        self._saved.clear()
+        self.chunk_cache.invalidate_all()
+        if self._focus is not None:
+            self.stream_around(*self._focus, wait=True)
+
+    def _fit_tile_id(self, tile_id: int):
+        if tile_id > np.iinfo(self.tile_dtype).max:
+            self.tile_dtype = np.uint16
+            for data in [chunk.data for chunk in self._chunks.values()] + list(self._saved.values()):
+                data.tile_grid = data.tile_grid.astype(np.uint16)
+
+    def _unload_static_objects(self):
+        self._cancel_pending()
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        for chunk in list(self._chunks.values()):
+            self._deactivate(chunk, save=False)
+        self._saved.clear()
+        self.camera = None
+        self._focus = None
+
+    def follow(self, camera: Camera):
+        """Держит мир загруженным вокруг цели камеры; чанки под целью загружаются сразу"""
+        self.camera = camera
+        focus = self._camera_focus()
+        if focus:
+            self.stream_around(*focus, wait=True)
+
+    def _camera_focus(self) -> Optional[Tuple[float, float]]:
+        if self.camera is None or self.camera.target is None:
+            return None
+        return utils.iso_to_cart_float(*self.camera.target.screen_position)
+
+    def stream_around(self, row: float, col: float, wait: bool = False):
+        """
+        Запрашивает недостающие чанки вокруг клетки (row, col) и вперёд по направлению движения,
+        выгружает отставшие. wait=True загружает недостающие чанки сразу, без фонового потока.
+        """
+        if self._focus is not None:
+            d_row, d_col = row - self._focus[0], col - self._focus[1]
+            if d_row or d_col:
+                self._heading = (int(np.sign(d_row)), int(np.sign(d_col)))
+        self._focus = (row, col)
+
+        center = self.chunk_of(int(row), int(col))
+        ahead = (center[0] + self._heading[0] * self.lookahead, center[1] + self._heading[1] * self.lookahead)
+        radius = self.view_radius
+
+        wanted = set()
+        for chunk_row, chunk_col in (center, ahead):
+            for r in range(max(0, chunk_row - radius), min(self.chunk_rows, chunk_row + radius + 1)):
+                for c in range(max(0, chunk_col - radius), min(self.chunk_cols, chunk_col + radius + 1)):
+                    wanted.add((r, c))
+
+        # Ближние к цели чанки запрашиваются первыми
+        missing = sorted((key for key in wanted if key not in self._chunks),
+                         key=lambda key: max(abs(key[0] - center[0]), abs(key[1] - center[1])))
+        for key in missing:
+            if wait:
+                self._load_now(key)
+            elif key not in self._pending:
+                self._request(key)
+
+        # Выгрузка с запасом в один чанк, чтобы не гонять чанки туда-обратно на границе
+        for key in [key for key in list(self._chunks) + list(self._pending) if key not in wanted]:
+            if max(abs(key[0] - center[0]), abs(key[1] - center[1])) <= radius + 1:
+                continue
+            chunk = self._chunks.get(key)
+            if chunk is not None:
+                self._deactivate(chunk)
+            future = self._pending.get(key)
+            if future is not None and future.cancel():
+                del self._pending[key]
+
+    def update_streaming(self, budget: Optional[float] = None):
+        """Переносит готовые чанки в мир в главном потоке, не дольше budget за кадр"""
+        deadline = perf_counter() + (self.activate_budget if budget is None else budget)
+        while self._ready:
+            self._finish(*self._ready.popleft())
+            if perf_counter() >= deadline:
+                break
+
+    def flush_streaming(self):
+        """Дожидается всех запрошенных чанков (для замеров и безголовых прогонов)"""
+        while self._pending:
+            if self._ready:
+                self._finish(*self._ready.popleft())
+            else:
+                time.sleep(0.001)
+
+    def generate_chunk(self, chunk_row: int, chunk_col: int) -> ChunkData:
+        """Генерирует чанк; вызывается в фоновом потоке, поэтому не создаёт игровых объектов"""
+        rng = default_rng((self.seed, chunk_row, chunk_col))
+        r0, c0, r1, c1 = self.chunk_tiles(chunk_row, chunk_col)
+        low, high = self._tile_range
+        tile_grid = rng.integers(low, high, size=(r1 - r0, c1 - c0), dtype=self.tile_dtype, endpoint=True)
+
+        placements: List[Placement] = []
+        taken = np.zeros(tile_grid.shape, dtype=bool)
+        for factory, density in self.scatter_objects:
+            cells = (rng.random(tile_grid.shape) < density) & ~taken
+            taken |= cells
+            rows, cols = np.nonzero(cells)
+            placements.extend((factory, r0 + r, c0 + c) for r, c in zip(rows.tolist(), cols.tolist()))
+        return ChunkData(tile_grid, placements)
+
+    def _request(self, key: ChunkKey):
+        if key in self._saved:
+            self._pending[key] = None
+            self._ready.append((key, self._generation, None, None))
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(1, thread_name_prefix="world-chunks")
+        self._pending[key] = self._executor.submit(self._work, key, self._generation)
+
+    def _work(self, key: ChunkKey, generation: int):
+        # Фоновый поток: только numpy, без pygame и игровых объектов
+        try:
+            self._ready.append((key, generation, self.generate_chunk(*key), None))
+        except Exception as e:  # ошибка печатается в главном потоке, поток не должен падать
+            self._ready.append((key, generation, None, e))
+
+    def _finish(self, key: ChunkKey, generation: int, data: Optional[ChunkData], error: Optional[Exception]):
+        if generation != self._generation:
+            return
+        self._pending.pop(key, None)
+        if error is not None:
+            print(f"Ошибка генерации чанка {key}: {error}")
+            return
+        if key in self._chunks:
+            return  # чанк уже загружен синхронно
+        data = self._saved.pop(key, data)
+        if data is not None:
+            self._activate(key, data)
+
+    def _cancel_pending(self):
+        for future in self._pending.values():
+            if future is not None:
+                future.cancel()
+        self._pending.clear()
+        self._ready.clear()
+
+    def _require_chunk(self, row: int, col: int) -> WorldChunk:
+        return self._chunk_at(row, col) or self._load_now(self.chunk_of(row, col))
+
+    def _load_now(self, key: ChunkKey) -> WorldChunk:
+        data = self._saved.pop(key, None) or self.generate_chunk(*key)
+        return self._activate(key, data)
+
+    def _activate(self, key: ChunkKey, data: ChunkData) -> WorldChunk:
+        if data.tile_grid.dtype != self.tile_dtype:
+            data.tile_grid = data.tile_grid.astype(self.tile_dtype)
+        row_start, col_start, _, _ = self.chunk_tiles(*key)
+        chunk = WorldChunk(key, row_start, col_start, data)
+        self._chunks[key] = chunk
+        for factory, row, col in data.placements:
+            self._place(chunk, factory(), row, col)
+        # Непроходимые области объектов соседних чанков могут заходить в этот чанк
+        for d_row in (-1, 0, 1):
+            for d_col in (-1, 0, 1):
+                neighbour = self._chunks.get((key[0] + d_row, key[1] + d_col))
+                if neighbour is not None and neighbour is not chunk:
+                    for footprint in neighbour.footprints:
+                        self._block_walk(footprint)
+        self.chunk_cache.invalidate_region(*self.chunk_tiles(*key))
+        return chunk
+
+    def _deactivate(self, chunk: WorldChunk, save: bool = True):
+        """Выгружает чанк и уничтожает его объекты; изменённый чанк сохраняется"""
+        del self._chunks[chunk.key]
+        for game_object in chunk.objects:
+            self.all_static_objects.discard(game_object)
+            self.render_order.remove(game_object)
+            collider = game_object.get_component("collider")
+            if collider:
+                self.colliders.remove(collider)
+                self.collision_system.remove(collider)
+            game_object.destroy()
+        if save and chunk.data.modified:
+            self._saved[chunk.key] = chunk.data
+        self.chunk_cache.invalidate_region(*self.chunk_tiles(*chunk.key))
+
+    def _place(self, chunk: WorldChunk, game_object: GameObject, row: int, col: int):
+        game_object.get_component("transform").set_cart(row, col)
+        local = (row - chunk.row_start, col - chunk.col_start)
+        handle = chunk.static_grid[local]
+        if handle >= 0:
+            self._discard_static_object(chunk.objects[handle])
+            chunk.objects[handle] = game_object
+        else:
+            chunk.static_grid[local] = len(chunk.objects)
+            chunk.objects.append(game_object)
+        self.all_static_objects.add(game_object)
+        self.render_order.insert(game_object)
+        collider = game_object.get_component("collider")
+        if collider:
+            self.colliders.insert(collider)
+
+        footprint = self._footprint(game_object, row, col)
+        if footprint:
+            chunk.footprints.append(footprint)
+            self._block_walk(footprint)
+
+    def _block_walk(self, footprint: Tuple[int, int, int, int]):
+        """Делает непроходимой область во всех загруженных чанках, которые она задевает"""
+        row_start, col_start, row_end, col_end = footprint
+        if row_start >= min(row_end, self.rows) or col_start >= min(col_end, self.cols):
+            return
+        for key in self._chunks_in(row_start, col_start, row_end, col_end):
+            chunk = self._chunks.get(key)
+            if chunk is None:
+                continue
+            r0, c0 = max(row_start, chunk.row_start) - chunk.row_start, max(col_start, chunk.col_start) - chunk.col_start
+            r1, c1 = row_end - chunk.row_start, col_end - chunk.col_start
+            chunk.walk_grid[r0:max(r0, r1), c0:max(c0, c1)] = 0
+
+    def update(self, delta_time):
+        with profiler.measure("Map.streaming"):
+            focus = self._camera_focus()
+            if focus:
+                self.stream_around(*focus)
+            self.update_streaming()
+        super().update(delta_time)
@@ -0,0 +1,99 @@
+from typing import Dict, List, Optional, Set, Tuple
+
+from game_objects.component_collider import ColliderComponent, CollisionBehavior, CollisionPhase
+from managers.mngevent import EventManager, EventType
+
+
+class CollisionSystem:
+    """
+    Единый проход столкновений за тик.
+    Широкая фаза - запрос к сетке коллайдеров карты (SpatialHash) только для движущихся
+    коллайдеров, поэтому стоимость растёт с числом движущихся объектов, а не всех объектов карты.
+    Узкая - пересечение границ. Пары BLOCK разводятся, для остальных отслеживаются
+    вход/пребывание/выход между кадрами.
+    """
+
+    def __init__(self, colliders: 'SpatialHash', event_manager: Optional[EventManager] = None):
+        # Сетка всех коллайдеров карты, её обновляет карта при перемещениях
+        self.colliders = colliders
+        self.event_manager = event_manager
+
+        # Движущиеся коллайдеры; словарь, чтобы порядок обхода не зависел от хэшей
+        self._dynamic: Dict[ColliderComponent, None] = {}
+        # Пары, пересекавшиеся на прошлом тике
+        self._contacts: Set[Tuple[ColliderComponent, ColliderComponent]] = set()
+
+    def add(self, collider: ColliderComponent):
+        """Регистрирует движущийся коллайдер; неподвижные находятся через сетку коллайдеров"""
+        self._dynamic[collider] = None
+
+    def remove(self, collider: ColliderComponent):
+        self._dynamic.pop(collider, None)
+        self._contacts = {pair for pair in self._contacts if collider not in pair}
+
+    def find_pairs(self) -> List[Tuple[ColliderComponent, ColliderComponent]]:
+        """Пары с пересекающимися границами, в которых хотя бы один коллайдер движущийся"""
+        pairs = {}
+        for collider in self._dynamic:
+            if not collider.enabled:
+                continue
+            bounds = collider.get_bounds()
+            for other in self.colliders.query(bounds):
+                if other is collider or not other.enabled:
+                    continue
+                if bounds.colliderect(other.get_bounds()):
+                    pairs[self._pair_key(collider, other)] = None
+        # Порядок разведения пар, как при проходе слева направо
+        return sorted(pairs, key=lambda pair: (pair[0].get_bounds().left, pair[1].get_bounds().left))
+
+    def update(self):
+        contacts = set()
+        for first, second in self.find_pairs():
+            if first.behavior == CollisionBehavior.BLOCK and second.behavior == CollisionBehavior.BLOCK:
+                self._resolve_block(first, second)
+            contacts.add((first, second))
+
+        for pair in contacts:
+            if pair in self._contacts:
+                self._dispatch(pair, CollisionPhase.STAY)
+            else:
+                pair[0].handle_collision(pair[1].game_object)
+                pair[1].handle_collision(pair[0].game_object)
+                self._dispatch(pair, CollisionPhase.ENTER)
+
+        for pair in self._contacts - contacts:
+            self._dispatch(pair, CollisionPhase.EXIT)
+
+        self._contacts = contacts
+
+    def _resolve_block(self, first: ColliderComponent, second: ColliderComponent):
+        """Выталкивает динамические коллайдеры друг из друга по оси наименьшего проникновения"""
+        first_bounds, second_bounds = first.get_bounds(), second.get_bounds()
+        overlap = first_bounds.clip(second_bounds)
+        if overlap.width == 0 or overlap.height == 0:
+            return
+
+        if overlap.width < overlap.height:
+            sign = -1 if first_bounds.centerx < second_bounds.centerx else 1
+            push = (sign * overlap.width, 0)
+        else:
+            sign = -1 if first_bounds.centery < second_bounds.centery else 1
+            push = (0, sign * overlap.height)
+
+        first_dynamic, second_dynamic = first in self._dynamic, second in self._dynamic
+        share = 0.5 if first_dynamic and second_dynamic else 1
+        if first_dynamic:
+            first.transform.move_screen(push[0] * share, push[1] * share)
+        if second_dynamic:
+            second.transform.move_screen(-push[0] * share, -push[1] * share)
+
+    def _dispatch(self, pair: Tuple[ColliderComponent, ColliderComponent], phase: CollisionPhase):
+        if self.event_manager is None:
+            return
+        first, second = pair
+        if first.trigger_events or second.trigger_events:
+            self.event_manager.emit(EventType.COLLISION, first.game_object, second.game_object, phase)
+
+    @staticmethod
+    def _pair_key(first: ColliderComponent, second: ColliderComponent) -> Tuple[ColliderComponent, ColliderComponent]:
+        return (first, second) if id(first) < id(second) else (second, first)
@@ -1,13 +1,12 @@
-from typing import Optional
+from typing import Optional, Mapping
 
+from game_objects.animation_library import AnimationClip, animation_library
+from game_objects.animation_system import BatchedFrameSequence
 from game_objects.component import Component
-from game_objects.component_transform import Direction
 from game_objects.component_controller import  ControllerComponent
 from game_objects.component_transform import  TransformComponent
-from game_objects.frame_sequence import FrameSequence
 
 import pygame
-import os
 
 from game_objects.movement_state import MovementState
 
@@ -16,10 +15,13 @@ class CharacterAnimationComponent(Component):
     def __init__(self, path,  offset: tuple = (0, 0)):
         super().__init__("animation")
 
-        #Анимация, направление, изображение, текущий кадр
-        self.sprite_list: dict[MovementState, dict[Direction, list[(Surface, int)]]] = {}
-        self.animations: dict[MovementState, FrameSequence] = {}
+        # Общие для всех персонажей клипы и собственное состояние проигрывания
+        self.clips: Mapping[MovementState, AnimationClip] = {}
+        # Кадры продвигает AnimationSystem, играет только последовательность текущего состояния
+        self.animations: dict[MovementState, BatchedFrameSequence] = {}
+        self._active_state: Optional[MovementState] = None
         self.surface = None
+        self.pivot = pygame.math.Vector2(0, 0)
         self.init_animations(path)
 
         self.offset = offset
@@ -30,63 +32,43 @@ class CharacterAnimationComponent(Component):
         self.transform: TransformComponent = game_object.get_component("transform")
 
     def init_animations(self, path: str):
-        for filename in os.listdir(path):
-            if not filename.endswith(".png"):
-                continue
-            character_name, animation_state, direction, frame_number = self.parse_character_filename(filename)
-            image_path = f"{path}/{filename}"
-            try:
-                image = pygame.image.load(image_path).convert_alpha()
-                state = MovementState(animation_state)
-                direction = Direction(direction)
-
-                if state not in self.sprite_list.keys():
-                    self.sprite_list[state] = {}
-                if direction not in self.sprite_list[state].keys():
-                    self.sprite_list[state][direction] = []
-
-                self.sprite_list[state][direction].append((image, frame_number))
-            except pygame.base.error as e:
-                print(f"Ошибка при загрузке файла {filename} : {e}")
-
-        for _, directions in self.sprite_list.items():
-            for direction, frames in directions.items():
-                directions[direction] = sorted(frames, key=lambda x: x[1])
-
-        for state in self.sprite_list.keys():
-            if state == MovementState.WALK:
-                self.animations[state] = \
-                    FrameSequence(state.name, len(self.sprite_list[state][Direction.S]), 0.1333)
-            if state == MovementState.IDLE:
-                self.animations[state] = \
-                    FrameSequence(state.name, len(self.sprite_list[state][Direction.S]), 0.45)
+        try:
+            self.clips = animation_library.get(path)
+        except (pygame.error, OSError, ValueError) as e:
+            print(f"Ошибка при загрузке анимаций {path} : {e}")
+            return
+
+        for state, clip in self.clips.items():
+            self.animations[state] = BatchedFrameSequence(state.name, clip.frames_number,
+                                                          clip.frame_duration, clip.loop)
             self.animations[state].run()
+            self.animations[state].pause()
 
-    def parse_character_filename(self, filename: str):
-        name_without_extension: str = filename.rsplit('.', 1)[0]
-        parts: [str] = name_without_extension.split('_')
-        if len(parts) != 4:
-            raise ValueError(f"Неверный формат имени файла {filename}")
-
-        character_name = parts[0]
-        action_type = parts[1]
-        direction = parts[2]
-        frame_number = int(parts[3])
-
-        return character_name, action_type, direction, frame_number
+    def on_detach(self) -> None:
+        super().on_detach()
+        for sequence in self.animations.values():
+            sequence.release()
+        self.animations.clear()
 
     def update(self, dt: float):
         super().update(dt)
         state = self.controller.movement_state
         direction = self.transform.direction
-        if state in self.sprite_list.keys():
-            self.animations[state].update(dt)
+        if state != self._active_state:
+            if self._active_state in self.animations:
+                self.animations[self._active_state].pause()
+            if state in self.animations:
+                self.animations[state].resume()
+            self._active_state = state
+
+        clip = self.clips.get(state)
+        if clip:
             frame = self.animations[state].get_frame()
-            self.surface = self.sprite_list[state][direction][frame][0]
+            self.surface, _, self.pivot = clip.frames[direction][frame]
 
     def render(self, surface: pygame.Surface, offset: Optional[pygame.math.Vector2] = None) -> None:
         if self.surface:
-            pos = self.transform.get_screen_position() + self.offset - offset
+            pos = self.transform.get_render_position() + self.offset + self.pivot - offset
             surface.blit(self.surface, pos)
 
 
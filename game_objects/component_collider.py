@@ -22,6 +22,12 @@ class CollisionBehavior(Enum):
     DAMAGE = auto()  # Наносит урон
 
 
+class CollisionPhase(Enum):
+    ENTER = auto()  # Пересечение началось в этом кадре
+    STAY = auto()  # Пересечение продолжается
+    EXIT = auto()  # Пересечение закончилось
+
+
 class ColliderComponent(Component):
 
     def __init__(self,
@@ -49,6 +55,7 @@ class ColliderComponent(Component):
 
 
     def on_attach(self, game_object: 'GameObject') -> None:
+        super().on_attach(game_object)
         self.transform = game_object.get_component("transform")
         if not self.transform:
             print("Для компонента Collider прежде нужно добавить TransformComponent")
@@ -64,7 +71,7 @@ class ColliderComponent(Component):
         if self.shape == ColliderShape.CIRCLE:
             radius = self.size[0]
             if self._bounds_cache:
-                self._bounds_cache.move(x - radius, y - radius)
+                self._bounds_cache.topleft = (x - radius, y - radius)
             else:
                 self._bounds_cache = Rect((x - radius, y - radius), (2 * radius, 2 * radius))
         elif self.shape == ColliderShape.RECTANGLE:
@@ -78,6 +85,24 @@ class ColliderComponent(Component):
         self._last_position = (x, y)
         return self._bounds_cache
 
+    def get_bounds_moved(self, dx: float, dy: float) -> Rect:
+        """Границы коллайдера после сдвига объекта на (dx, dy); кэш границ не меняется"""
+        position = self.transform.screen_position
+        x, y = position + self.transform.direction.to_vector() * self.stride
+        x, y = x + dx, y + dy
+
+        # Позиция задаётся через topleft, как в get_bounds: конструктор Rect дробные координаты
+        # отбрасывает, а присваивание округляет
+        if self.shape == ColliderShape.CIRCLE:
+            radius = self.size[0]
+            bounds = Rect((0, 0), (2 * radius, 2 * radius))
+            bounds.topleft = (x - radius, y - radius)
+        else:
+            half_w, half_h = self.size[0] / 2, self.size[1] / 2
+            bounds = Rect((0, 0), self.size)
+            bounds.topleft = (x - half_w, y - half_h)
+        return bounds
+
     def contains_point(self, point: Tuple[float, float],
                        position: Tuple[float, float]) -> bool:
         px, py = point
@@ -113,7 +138,7 @@ class ColliderComponent(Component):
 
     def handle_collision(self, other_obj: GameObject):
         if self.on_collision:
-            self.on_collision(self.parent, other_obj)
+            self.on_collision(self.game_object, other_obj)
 
     def render(self, surface: pygame.Surface, offset: Optional[pygame.math.Vector2] = None) -> None:
         r = self.get_bounds()
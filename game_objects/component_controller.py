@@ -84,19 +84,30 @@ class ControllerComponent(Component):
             if not self.map_ref.is_walkable(r, c):
                 return
 
-            for obj in self.map_ref.all_static_objects:
-                other = obj.get_component("collider")
-                #print(other)
-                if other:
-                    res = self.collider.check_collision(other)
-                    if res and other.behavior == CollisionBehavior.BLOCK:
-                        return
-
-
             move_x = self.move_vector.x * delta_time
             move_y = (self.move_vector.y * delta_time)/2
+
+            if self.collider and self._is_blocked(move_x, move_y):
+                return
+
             self.transform.move_screen(move_x, move_y)
 
+    def _is_blocked(self, move_x: float, move_y: float) -> bool:
+        """
+        Упрётся ли объект после сдвига в блокирующий коллайдер. Проверяются только
+        коллайдеры рядом с новыми границами; с теми, в которые объект уже вошёл,
+        шаг не запрещается - их расталкивает CollisionSystem карты.
+        """
+        bounds = self.collider.get_bounds_moved(move_x, move_y)
+        current = self.collider.get_bounds()
+        for other in self.map_ref.colliders_near(bounds):
+            if other is self.collider or not other.enabled or other.behavior != CollisionBehavior.BLOCK:
+                continue
+            other_bounds = other.get_bounds()
+            if bounds.colliderect(other_bounds) and not current.colliderect(other_bounds):
+                return True
+        return False
+
     def render(self, surface: pygame.Surface, offset: Optional[pygame.math.Vector2] = None) -> None:
 
         pygame.draw.circle(surface, (255, 255, 0), self.test_point - offset, 5)
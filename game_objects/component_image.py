@@ -3,12 +3,14 @@ from typing import Optional
 import pygame
 
 from game_objects.component import Component
+from managers.mngresource import resource_manager
 
 
 class ImageComponent(Component):
     def __init__(self, filename, offset: tuple = (0, 0)):
         super().__init__("image")
-        self.surface = pygame.image.load(filename).convert_alpha()
+        self.filename = filename
+        self.surface = resource_manager.load_image(filename)
         self.transform: Optional['TransformComponent'] = None
         self.offset: pygame.math.Vector2 = pygame.math.Vector2(offset)
 
@@ -18,9 +20,15 @@ class ImageComponent(Component):
         if self.transform is None:
             print(f"Не найден компонент для позиционирования в GameObject: {game_object.name}")
 
+    def on_detach(self) -> None:
+        super().on_detach()
+        if self.surface:
+            resource_manager.release_image(self.filename)
+            self.surface = None
+
     def render(self, surface: pygame.Surface,  offset) -> None:
         if self.enabled and self.surface:
-            pos = self.transform.get_screen_position() + self.offset - offset
+            pos = self.transform.get_render_position() + self.offset - offset
             surface.blit(self.surface, pos)
 
 
@@ -78,6 +78,9 @@ class TransformComponent(Component):
 
     def __init__(self, row: int = 0, col: int = 0):
         super().__init__("transform")
+        # Позиция на начало последнего шага симуляции и доля шага для отрисовки (задаёт карта)
+        self.previous_position = pygame.math.Vector2(0, 0)
+        self.render_alpha = 1.0
         # Позиция в экранных координатах (пиксели)
         self.set_cart(row, col)
 
@@ -97,6 +100,8 @@ class TransformComponent(Component):
         self.col = col
         pos = utils.cart_to_iso(row, col, settings.tile_size)
         self.screen_position = pygame.math.Vector2(pos)
+        # Перенос без интерполяции
+        self.previous_position = self.screen_position.copy()
         self.emit(self.EventType.POSITION_CHANGED)
 
 
@@ -114,6 +119,16 @@ class TransformComponent(Component):
         """Возвращает экранную позицию (для отрисовки)"""
         return self.screen_position.copy()
 
+    def get_render_position(self) -> pygame.math.Vector2:
+        """Позиция для отрисовки: между двумя последними состояниями симуляции"""
+        if self.render_alpha >= 1:
+            return self.screen_position.copy()
+        return self.previous_position.lerp(self.screen_position, self.render_alpha)
+
+    def begin_step(self):
+        """Запоминает позицию на начало шага симуляции"""
+        self.previous_position.update(self.screen_position)
+
     def set_screen_position(self, x: float, y: float):
         """Устанавливает экранную позицию"""
         self.screen_position.x = x
@@ -40,6 +40,10 @@ class FrameSequence:
     def pause(self):
         self.is_playing = False
 
+    def resume(self):
+        """Продолжает проигрывание с текущего кадра"""
+        self.is_playing = True
+
 
 
 
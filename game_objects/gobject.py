@@ -1,7 +1,9 @@
 import uuid
+from time import perf_counter
 from typing import Dict, Optional, List
 import pygame
 from game_objects.component import Component
+from managers.mngprofiler import profiler
 
 
 class GameObject:
@@ -44,6 +46,17 @@ class GameObject:
             return True
         return False
 
+    def destroy(self):
+        """Отсоединяет все компоненты (они освобождают свои ресурсы) и уничтожает детей"""
+        for child in list(self.children):
+            child.destroy()
+        for component_name in list(self.components):
+            self.remove_component(component_name)
+
+    def get_level_params(self) -> dict:
+        """Аргументы конструктора, с которыми объект создаётся заново из файла уровня"""
+        return {}
+
     def add_child(self, child: 'GameObject') -> bool:
         if child.parent:
             child.parent.remove_child(child)
@@ -68,8 +81,14 @@ class GameObject:
     def update(self, delta_time: float) -> None:
         if not self.enabled:
             return
-        for component in self.components.values():
-            component.update(delta_time)
+        if profiler.enabled:
+            for component in self.components.values():
+                start = perf_counter()
+                component.update(delta_time)
+                profiler.add(f"{type(component).__name__}.update", perf_counter() - start)
+        else:
+            for component in self.components.values():
+                component.update(delta_time)
 
         for child in self.children:
             child.update(delta_time)
@@ -77,8 +96,14 @@ class GameObject:
     def render(self, surface: pygame.Surface, camera_offset: Optional[pygame.math.Vector2] = None) -> None:
         if not self.enabled:
             return
-        for component in self.components.values():
-            component.render(surface, camera_offset)
+        if profiler.enabled:
+            for component in self.components.values():
+                start = perf_counter()
+                component.render(surface, camera_offset)
+                profiler.add(f"{type(component).__name__}.render", perf_counter() - start)
+        else:
+            for component in self.components.values():
+                component.render(surface, camera_offset)
 
         for child in self.children:
             child.render(surface, camera_offset)
@@ -86,7 +111,7 @@ class GameObject:
         if self.is_show_origins:
             trans_comp = self.get_component("transform")
             if trans_comp:
-                pygame.draw.circle(surface, (255, 0, 255, 255), trans_comp.screen_position - camera_offset, 2)
+                pygame.draw.circle(surface, (255, 0, 255, 255), trans_comp.get_render_position() - camera_offset, 2)
 
     def handle_event(self, event: pygame.event.Event) -> bool:
         if not self.enabled:
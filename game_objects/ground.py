@@ -1,13 +1,24 @@
 import random
-from typing import Dict, Optional, List, Tuple, Set
+from typing import Dict, Optional, List, Tuple, Set, Callable
 
+import numpy as np
 import pygame
+# numpy.random импортируется лениво и долго (~10 мс) - не при создании первой карты посреди кадра
+from numpy.random import default_rng
 
 import settings
 import utils
 from game_objects.camera import Camera
 from game_objects.gobject import GameObject
-from game_objects.component_collider import CollisionBehavior
+from game_objects.component_collider import CollisionBehavior, ColliderComponent
+from game_objects.component_transform import TransformComponent
+from game_objects.collision_system import CollisionSystem
+from game_objects.level_file import LevelFile, STATIC_OBJECT_TYPES
+from game_objects.render_order import RenderOrder
+from game_objects.tile_chunk_cache import TileChunkCache
+from managers.mngevent import EventManager
+from managers.mngprofiler import profiler
+from managers.mngresource import resource_manager
 from uuid import UUID
 
 class TileType:
@@ -22,89 +33,345 @@ class TileType:
         self.surface: Optional['pygame.surface.Surface'] = None
 
     def load_image(self):
-        self.surface = pygame.image.load(self.image_path).convert_alpha()
+        self.surface = resource_manager.load_image(self.image_path)
+
+    def release_image(self):
+        if self.surface is not None:
+            resource_manager.release_image(self.image_path)
+            self.surface = None
+
+
+class SpatialHash:
+    """
+    Равномерная сетка экранных ячеек для быстрого поиска коллайдеров рядом с прямоугольником.
+    Коллайдер хранится во всех ячейках, которые пересекают его границы.
+    """
+
+    def __init__(self, cell_size: int = 128):
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], Set[ColliderComponent]] = {}
+        # коллайдер -> диапазон занятых ячеек (x0, y0, x1, y1)
+        self._ranges: Dict[ColliderComponent, Tuple[int, int, int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._ranges)
+
+    def __contains__(self, collider: ColliderComponent) -> bool:
+        return collider in self._ranges
+
+    def _cell_range(self, rect: pygame.Rect) -> Tuple[int, int, int, int]:
+        size = self.cell_size
+        return rect.left // size, rect.top // size, (rect.right - 1) // size, (rect.bottom - 1) // size
+
+    def insert(self, collider: ColliderComponent):
+        if collider in self._ranges:
+            self.update(collider)
+            return
+        cell_range = self._cell_range(collider.get_bounds())
+        self._ranges[collider] = cell_range
+        self._add_to_cells(collider, cell_range)
+
+    def remove(self, collider: ColliderComponent):
+        cell_range = self._ranges.pop(collider, None)
+        if cell_range:
+            self._remove_from_cells(collider, cell_range)
+
+    def update(self, collider: ColliderComponent):
+        """Переносит коллайдер в новые ячейки, если его границы сменили ячейку"""
+        old_range = self._ranges.get(collider)
+        if old_range is None:
+            return
+        new_range = self._cell_range(collider.get_bounds())
+        if new_range == old_range:
+            return
+        self._remove_from_cells(collider, old_range)
+        self._ranges[collider] = new_range
+        self._add_to_cells(collider, new_range)
+
+    def query(self, rect: pygame.Rect) -> Set[ColliderComponent]:
+        """Коллайдеры из ячеек, которые пересекает rect (кандидаты для точной проверки)"""
+        x0, y0, x1, y1 = self._cell_range(rect)
+        result: Set[ColliderComponent] = set()
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self._cells.get((cx, cy))
+                if cell:
+                    result.update(cell)
+        return result
+
+    def _add_to_cells(self, collider: ColliderComponent, cell_range: Tuple[int, int, int, int]):
+        x0, y0, x1, y1 = cell_range
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                self._cells.setdefault((cx, cy), set()).add(collider)
+
+    def _remove_from_cells(self, collider: ColliderComponent, cell_range: Tuple[int, int, int, int]):
+        x0, y0, x1, y1 = cell_range
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self._cells.get((cx, cy))
+                if cell:
+                    cell.discard(collider)
+                    if not cell:
+                        del self._cells[(cx, cy)]
 
 
 class Map:
-    def __init__(self, rows, cols, tile_size: tuple = (256, 128)):
+    # Карту можно сохранить в файл уровня и открыть из него (save, load)
+    persistent = True
+    # Типы тайлов карты: (id, имя, проходимость, изображение)
+    TILE_TYPES = [
+        (0, "Grass", True, "assets/image/Ground/Grass_3.png"),
+        (1, "Dirt", True, "assets/image/Ground/Dirt_1.png"),
+    ]
+
+    def __init__(self, rows, cols, tile_size: tuple = (256, 128), level: Optional[LevelFile] = None):
+        """level - открытый файл уровня: сетки, типы тайлов и объекты берутся из него, см. Map.load"""
 
         self.tile_size = tile_size  # Размер тайла в пикселях (для спрайтов)
 
         self.rows = rows
         self.cols = cols
-        # Двумерный массив индексов тайлов [y][x]
-        self.tile_grid: list[list[int]] = [[0 for _ in range(0, self.cols)] for _ in range(0, self.rows)]
-        self.walk_grid: list[list[float]] = [[1 for _ in range(cols)] for _ in range(rows)]
-        self.static_objects: list[list[Optional['GameObject']]] = [[None for _ in range(cols)] for _ in range(rows)]
+        self._create_grids(level)
 
         self.all_static_objects: Set[GameObject] = set()
         self.all_dynamic_objects: Set[GameObject] = set()
-        self.render_stack: List[Tuple[UUID, int, GameObject]] = []  # (uuid, z_index, object)
+        # Объекты в порядке отрисовки, обновляется только при перемещениях
+        self.render_order = RenderOrder()
+        self._position_handlers: Dict[UUID, Callable] = {}
+        # Коллайдеры статических и динамических объектов для поиска соседей
+        self.colliders = SpatialHash(self.tile_size[1])
+        self.event_manager = EventManager()
+        self.collision_system = CollisionSystem(self.colliders, self.event_manager)
+        # Запас (в пикселях) вокруг экрана для объектов, чьи спрайты выше своего тайла
+        self.object_cull_margin = 768
 
         # Словарь типов тайлов: tile_id -> TileType
         self.tile_types: Dict[float, TileType] = {}
 
-        # Позиция карты в мире (изометрические координаты)
-        self._register_tiles()
-        self.fill_random_grid(0, 1)
-
+        # Кэш заранее отрисованных блоков тайлов
+        self.chunk_cache = TileChunkCache(self)
 
+        # Позиция карты в мире (изометрические координаты)
+        if level is None:
+            self._register_tiles()
+            self.fill_random_grid(0, 1)
+        else:
+            self._apply_level(level)
+
+    def _create_grids(self, level: Optional[LevelFile] = None):
+        if level is None:
+            # Индексы тайлов [row, col]; тип расширяется до uint16, если id тайла не помещается в uint8
+            self.tile_grid: np.ndarray = np.zeros((self.rows, self.cols), dtype=np.uint8)
+            # Стоимость прохода по клетке, 0 - непроходима
+            self.walk_grid: np.ndarray = np.ones((self.rows, self.cols), dtype=np.float32)
+        else:
+            self.tile_grid = level.tile_grid
+            self.walk_grid = level.walk_grid
+        # Статические объекты по клеткам: номер в _static_handles, 0 - клетка пуста.
+        # Нули, а не -1: np.zeros не трогает память, пока в неё не пишут
+        self.static_grid: np.ndarray = np.zeros((self.rows, self.cols), dtype=np.int32)
+        self._static_handles: List[Optional[GameObject]] = [None]
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'Map':
+        """
+        Открывает карту из файла уровня (см. LevelFile). С mmap=True сетки читаются с диска
+        по мере обращения, изменения карты остаются в памяти до save()
+        """
+        level = LevelFile.read(path, mmap)
+        return cls(level.rows, level.cols, level.tile_size, level=level)
+
+    def save(self, path: str):
+        """Сохраняет сетки, типы тайлов и статические объекты в файл уровня"""
+        tile_types = [(tile_type.tile_id, tile_type.name, tile_type.is_walkable, tile_type.walkable_speed,
+                       tile_type.image_path) for tile_type in self.tile_types.values()]
+        objects = []
+        for game_object in self._static_handles[1:]:
+            row, col = game_object.get_component("transform").get_cart()
+            objects.append((type(game_object).__name__, row, col, game_object.get_level_params()))
+        LevelFile(self.rows, self.cols, self.tile_size, self.tile_grid, self.walk_grid,
+                  tile_types, objects).write(path)
+
+    def _apply_level(self, level: LevelFile):
+        for tile_id, name, walkable, walkable_speed, image_path in level.tile_types:
+            self.add_tile_type(TileType(tile_id, name, walkable, image_path, walkable_speed))
+        for type_name, row, col, params in level.objects:
+            factory = STATIC_OBJECT_TYPES.get(type_name)
+            if factory is None:
+                print(f"Неизвестный тип объекта {type_name} в уровне")
+                continue
+            self.add_static_object(factory(**params), row, col)
+
+    def is_loaded(self, row_start: int, col_start: int, row_end: int, col_end: int) -> bool:
+        """Загружены ли все клетки прямоугольника (конец не включается); обычная карта в памяти целиком"""
+        return True
 
     def is_walkable(self, row: int, col: int) -> bool:
         if not (0 <= row < self.rows and 0 <= col < self.cols):
             return False  # выход за границы карты
 
-        if self.walk_grid[row][col] == 0:
+        if self.walk_grid[row, col] == 0:
             return False
         return True
 
+    def walkable_mask(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """Проходимость сразу для массивов клеток; клетки за границей карты непроходимы"""
+        rows = np.asarray(rows)
+        cols = np.asarray(cols)
+        inside = (rows >= 0) & (rows < self.rows) & (cols >= 0) & (cols < self.cols)
+        result = np.zeros(inside.shape, dtype=bool)
+        result[inside] = self.walk_grid[rows[inside], cols[inside]] != 0
+        return result
+
+    def get_static_object(self, row: int, col: int) -> Optional[GameObject]:
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return None
+        return self._static_handles[self.static_grid[row, col]]
+
     def add_static_object(self, game_object: GameObject, row: int, col: int):
+        """Ставит объект в клетку; объект, который уже стоял в ней, уничтожается"""
         if not (0 <= row < self.rows and 0 <= col < self.cols):
             return
 
         transform = game_object.get_component("transform")
         if transform:
             transform.set_cart(row, col)
-            self.static_objects[row][col] = game_object
+            handle = self.static_grid[row, col]
+            if handle:
+                self._discard_static_object(self._static_handles[handle])
+                self._static_handles[handle] = game_object
+            else:
+                self.static_grid[row, col] = len(self._static_handles)
+                self._static_handles.append(game_object)
             self.all_static_objects.add(game_object)
-
-            if game_object.name == "House":
-                for i in range(3):
-                    for j in range(3):
-                        self.walk_grid[row+i+1][col-j] = 0
-
-
+            self.render_order.insert(game_object)
+            collider = game_object.get_component("collider")
+            if collider:
+                self.colliders.insert(collider)
+
+            footprint = self._footprint(game_object, row, col)
+            if footprint:
+                r0, c0, r1, c1 = footprint
+                self.walk_grid[r0:r1, c0:c1] = 0
+
+    def _discard_static_object(self, game_object: GameObject):
+        """Убирает статический объект из наборов карты и уничтожает его; клетки сетки не трогает"""
+        self.all_static_objects.discard(game_object)
+        self.render_order.remove(game_object)
+        collider = game_object.get_component("collider")
+        if collider:
+            self.colliders.remove(collider)
+        game_object.destroy()
+
+    @staticmethod
+    def _footprint(game_object: GameObject, row: int, col: int) -> Optional[Tuple[int, int, int, int]]:
+        """Непроходимые клетки под объектом (row_start, col_start, row_end, col_end) или None"""
+        if game_object.name == "House":
+            return row + 1, max(0, col - 2), row + 4, col + 1
+        return None
 
     def add_dinamic_object(self, game_object: GameObject, row: int, col: int):
         if not (0 <= row < self.rows and 0 <= col < self.cols):
             return
-        game_object.get_component("transform").set_cart(row, col)
+        transform = game_object.get_component("transform")
+        transform.set_cart(row, col)
         self.all_dynamic_objects.add(game_object)
+        self.render_order.insert(game_object, dynamic=True)
+        collider = game_object.get_component("collider")
+        if collider:
+            self.colliders.insert(collider)
+            self.collision_system.add(collider)
+
+        if game_object.id not in self._position_handlers:
+            handler = lambda: self._on_object_moved(game_object)
+            self._position_handlers[game_object.id] = handler
+            # Смещение коллайдера зависит и от направления
+            transform.on_event(TransformComponent.EventType.POSITION_CHANGED, handler)
+            transform.on_event(TransformComponent.EventType.DIRECTION_CHANGED, handler)
+
+    def remove_dinamic_object(self, game_object: GameObject):
+        self.all_dynamic_objects.discard(game_object)
+        self.render_order.remove(game_object)
+        collider = game_object.get_component("collider")
+        if collider:
+            self.colliders.remove(collider)
+            self.collision_system.remove(collider)
+        handler = self._position_handlers.pop(game_object.id, None)
+        if handler:
+            transform = game_object.get_component("transform")
+            transform.off_event(TransformComponent.EventType.POSITION_CHANGED, handler)
+            transform.off_event(TransformComponent.EventType.DIRECTION_CHANGED, handler)
+
+    def unload(self):
+        """Уничтожает все объекты карты и отпускает изображения тайлов"""
+        for game_object in list(self.all_dynamic_objects):
+            self.remove_dinamic_object(game_object)
+            game_object.destroy()
+        self._unload_static_objects()
+        self.render_order = RenderOrder()
+        self.colliders = SpatialHash(self.tile_size[1])
+        self.collision_system = CollisionSystem(self.colliders, self.event_manager)
+
+        for tile_type in self.tile_types.values():
+            tile_type.release_image()
+        self.chunk_cache.invalidate_all()
+
+    def _unload_static_objects(self):
+        for game_object in self.all_static_objects:
+            game_object.destroy()
+        self.all_static_objects.clear()
+        self.static_grid.fill(0)
+        del self._static_handles[1:]
+
+    def _on_object_moved(self, game_object: GameObject):
+        self.render_order.update(game_object)
+        collider = game_object.get_component("collider")
+        if collider:
+            self.colliders.update(collider)
+
+    def colliders_near(self, rect: pygame.Rect) -> Set[ColliderComponent]:
+        """Коллайдеры, которые могут пересекаться с rect"""
+        return self.colliders.query(rect)
 
     def _register_tiles(self):
-        self.add_tile_type(TileType(0, "Grass", True, "assets/image/Ground/Grass_3.png"))
-        self.add_tile_type(TileType(1, "Dirt", True, "assets/image/Ground/Dirt_1.png"))
+        for tile_id, name, walkable, image_path in self.TILE_TYPES:
+            self.add_tile_type(TileType(tile_id, name, walkable, image_path))
 
     def add_tile_type(self, tile_type: TileType):
         """Добавляет тип тайла"""
+        self._fit_tile_id(tile_type.tile_id)
         self.tile_types[tile_type.tile_id] = tile_type
         tile_type.load_image()
+        self.chunk_cache.invalidate_all()
+
+    def _fit_tile_id(self, tile_id: int):
+        if tile_id > np.iinfo(self.tile_grid.dtype).max:
+            self.tile_grid = self.tile_grid.astype(np.uint16)
 
     def set_tile(self, x: int, y: int, tile_id: int):
         """Устанавливает тайл в позицию (x, y)"""
         if 0 <= x < self.cols and 0 <= y < self.rows:
-            self.tile_grid[y][x] = tile_id
+            if self.tile_grid[y, x] != tile_id:
+                self.tile_grid[y, x] = tile_id
+                self.chunk_cache.invalidate(y, x)
 
     def get_tile(self, x: int, y: int) -> int:
         """Возвращает ID тайла в позиции (x, y)"""
         if 0 <= x < self.cols and 0 <= y < self.rows:
-            return self.tile_grid[y][x]
+            return int(self.tile_grid[y, x])
         return 0
 
+    def get_region(self, row_start: int, col_start: int, row_end: int, col_end: int) -> np.ndarray:
+        """Представление (без копии) прямоугольника tile_grid, обрезанного по границам карты"""
+        return self.tile_grid[max(0, row_start):max(0, row_end), max(0, col_start):max(0, col_end)]
+
     def fill_random_grid(self, min_range_val: int, max_range_val: int):
-        for row in range(self.rows):
-            for col in range(self.cols):
-                self.tile_grid[row][col] = random.randint(min_range_val, max_range_val)
+        # Генератор NumPy засевается из random, чтобы random.seed() по-прежнему задавал карту
+        rng = default_rng(random.getrandbits(64))
+        self.tile_grid[:] = rng.integers(min_range_val, max_range_val, size=self.tile_grid.shape,
+                                        dtype=self.tile_grid.dtype, endpoint=True)
+        self.chunk_cache.invalidate_all()
 
     def region_to_draw(self, row, col, reg_size):
         r_top_left = max(0, row - reg_size // 2)
@@ -114,50 +381,55 @@ class Map:
 
         return r_top_left, c_top_left, r_bot_right, c_bot_right
 
-    def update_render_stack(self, row, col, offset):
-        rtl, ctl, rbr, cbr = self.region_to_draw(row, col, 17)
-        for r in range(rtl, rbr):
-            for c in range(ctl, cbr):
-                z = utils.z_stack_value(r, c) - offset.y
-                if self.static_objects[r][c]:
-                    self.render_stack.append((self.static_objects[r][c].id, z, self.static_objects[r][c]))
-
-        for obj in self.all_dynamic_objects:
-            if obj:
-                x, y = obj.get_component('transform').screen_position
-                z = y - offset.y
-                self.render_stack.append((obj.id, z, obj))
-
-        self.render_stack.sort(key=lambda item: item[1])
+    def visible_spans(self, view_rect: pygame.Rect, margin: int = 0) -> List[Tuple[int, int, int]]:
+        """Строки тайлов (row, col_start, col_end), ромбы которых пересекают view_rect (+ margin)"""
+        return utils.visible_tile_spans(view_rect.inflate(margin * 2, margin * 2),
+                                        self.rows, self.cols, self.tile_size)
 
     def render(self, surface: pygame.Surface, offset: Optional[pygame.math.Vector2] = pygame.math.Vector2(0, 0)):
         map_offset = (self.tile_size[0] // 2, self.tile_size[1] // 2)
         self.offset = -offset - map_offset if offset is not None else self.offset - map_offset
-        r, c = utils.iso_to_cart(offset.x + settings.screen_width // 2, offset.y + settings.screen_height // 2)
+        view_rect = pygame.Rect((offset.x, offset.y), surface.get_size())
 
-        self.update_render_stack(r, c, offset)
-        reg = self.region_to_draw(r, c, 17)
+        with profiler.measure("Map.render ground"):
+            self.render_ground(surface, self.visible_spans(view_rect))
 
-        for r in range(reg[0], reg[2]):
-            for c in range(reg[1], reg[3]):
-                id = self.tile_grid[r][c]
-                pos = utils.cart_to_iso(r, c)
-                surface.blit(self.tile_types[id].surface, self.offset + pos)
-
-        for _, _, obj in self.render_stack:
-            if obj:
+        with profiler.measure("Map.render objects"):
+            for obj in self.render_order.visible(view_rect, self.object_cull_margin):
                 obj.render(surface, offset)
-
-        self.render_stack.clear()
         """
         for r in range(0, self.rows):
             for c in range(0, self.cols):
-                id = self.tile_grid[r][c]
+                id = self.tile_grid[r, c]
                 pos = utils.cart_to_iso(r, c)
 
                 surface.blit(self.tile_types[id].surface, self.offset + pos)
           """
 
+    def render_ground(self, surface: pygame.Surface, spans: List[Tuple[int, int, int]]):
+        """Рисует землю запечёнными чанками, в которые попадают видимые тайлы"""
+        cache = self.chunk_cache
+        chunks = set()
+        for r, ctl, cbr in spans:
+            chunk_r, chunk_ctl = cache.chunk_of(r, ctl)
+            _, chunk_cbr = cache.chunk_of(r, cbr - 1)
+            for chunk_c in range(chunk_ctl, chunk_cbr + 1):
+                chunks.add((chunk_r, chunk_c))
+
+        for chunk_r, chunk_c in sorted(chunks):
+            if not self.is_loaded(*cache.chunk_tiles(chunk_r, chunk_c)):
+                continue
+            chunk_surface, world_pos = cache.get_chunk(chunk_r, chunk_c)
+            surface.blit(chunk_surface, self.offset + world_pos)
+
+    def interpolate(self, alpha: float):
+        """Динамические объекты рисуются на доле alpha между началом и концом последнего шага симуляции"""
+        for obj in self.all_dynamic_objects:
+            obj.get_component("transform").render_alpha = alpha
+
     def update(self, delta_time):
         for obj in self.all_dynamic_objects:
+            obj.get_component("transform").begin_step()
             obj.update(delta_time)
+        with profiler.measure("Map.collisions"):
+            self.collision_system.update()
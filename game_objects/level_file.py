@@ -0,0 +1,200 @@
+import json
+import os
+import struct
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from game_objects.gobject import GameObject
+
+LEVEL_MAGIC = b"FLVL"
+LEVEL_VERSION = 1
+
+# Классы статических объектов, которые можно записать в уровень, по имени класса
+STATIC_OBJECT_TYPES: Dict[str, Callable[..., GameObject]] = {}
+
+# (id, имя, проходимость, скорость прохода, изображение)
+TileTypeRecord = Tuple[int, str, bool, float, Optional[str]]
+# (имя класса, row, col, параметры конструктора)
+ObjectRecord = Tuple[str, int, int, dict]
+
+# Порядок разделов файла; в заголовке для каждого хранится (смещение, размер)
+_SECTIONS = ("tiles", "walk", "tile_types", "object_types", "objects", "params")
+# магия, версия, rows, cols, ширина и высота тайла, тип tile_grid, таблица разделов
+_HEADER = struct.Struct("<4sH2xIIHH8s" + "QQ" * len(_SECTIONS))
+_TILE_TYPE = struct.Struct("<HBd")
+_STRING_SIZE = struct.Struct("<H")
+_NO_STRING = 0xFFFF
+_ALIGN = 64
+
+OBJECT_RECORD = np.dtype([("type", "<u2"), ("row", "<u4"), ("col", "<u4"),
+                          ("params_offset", "<u4"), ("params_size", "<u4")])
+
+
+def register_static_object(cls):
+    """Декоратор класса статического объекта: в уровне объект хранится под именем класса"""
+    STATIC_OBJECT_TYPES[cls.__name__] = cls
+    return cls
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _pack_string(value: Optional[str]) -> bytes:
+    if value is None:
+        return _STRING_SIZE.pack(_NO_STRING)
+    data = value.encode("utf-8")
+    return _STRING_SIZE.pack(len(data)) + data
+
+
+def _unpack_string(data: bytes, offset: int) -> Tuple[Optional[str], int]:
+    (size,) = _STRING_SIZE.unpack_from(data, offset)
+    offset += _STRING_SIZE.size
+    if size == _NO_STRING:
+        return None, offset
+    return data[offset:offset + size].decode("utf-8"), offset + size
+
+
+class LevelFile:
+    """
+    Двоичный файл уровня. После заголовка идут разделы, выровненные по 64 байтам:
+
+        tiles         tile_grid [rows, cols] как есть
+        walk          walk_grid [rows, cols], float32
+        tile_types    типы тайлов: id, проходимость, скорость прохода, имя, изображение
+        object_types  имена классов статических объектов
+        objects       записи OBJECT_RECORD: тип, row, col, параметры
+        params        параметры конструкторов объектов в JSON
+
+    Сетки открываются отображением файла в память (копирование при записи): большой уровень
+    открывается сразу, с диска читаются только затронутые страницы, а изменения сеток
+    остаются в памяти и в файл не попадают.
+    """
+
+    def __init__(self, rows: int, cols: int, tile_size: Tuple[int, int], tile_grid: np.ndarray,
+                 walk_grid: np.ndarray, tile_types: List[TileTypeRecord], objects: List[ObjectRecord]):
+        self.rows = rows
+        self.cols = cols
+        self.tile_size = tile_size
+        self.tile_grid = tile_grid
+        self.walk_grid = walk_grid
+        self.tile_types = tile_types
+        self.objects = objects
+
+    def write(self, path: str):
+        """
+        Записывает уровень. Файл пишется рядом и подменяется целиком, поэтому уровень
+        можно сохранить поверх файла, из которого открыты его же сетки.
+        """
+        tiles = np.ascontiguousarray(self.tile_grid, dtype=self.tile_grid.dtype.newbyteorder("<"))
+        walk = np.ascontiguousarray(self.walk_grid, dtype="<f4")
+
+        tile_types = b"".join(_TILE_TYPE.pack(tile_id, walkable, speed) + _pack_string(name) + _pack_string(image)
+                              for tile_id, name, walkable, speed, image in self.tile_types)
+
+        type_names: List[str] = []
+        type_index: Dict[str, int] = {}
+        records = np.zeros(len(self.objects), dtype=OBJECT_RECORD)
+        params = bytearray()
+        for i, (type_name, row, col, object_params) in enumerate(self.objects):
+            if type_name not in type_index:
+                type_index[type_name] = len(type_names)
+                type_names.append(type_name)
+            data = json.dumps(object_params, ensure_ascii=False).encode("utf-8") if object_params else b""
+            records[i] = (type_index[type_name], row, col, len(params), len(data))
+            params += data
+        object_types = b"".join(_pack_string(name) for name in type_names)
+
+        sections = [tiles, walk, tile_types, object_types, records, bytes(params)]
+        table = []
+        offset = _align(_HEADER.size)
+        for data in sections:
+            size = data.nbytes if isinstance(data, np.ndarray) else len(data)
+            table += [offset, size]
+            offset = _align(offset + size)
+
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as file:
+            file.write(_HEADER.pack(LEVEL_MAGIC, LEVEL_VERSION, self.rows, self.cols, *self.tile_size,
+                                    tiles.dtype.str.encode("ascii"), *table))
+            for i, data in enumerate(sections):
+                file.seek(table[i * 2])
+                file.write(data)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def read(cls, path: str, mmap: bool = True) -> 'LevelFile':
+        """Открывает уровень; повреждённый или чужой файл - ValueError"""
+        file_size = os.path.getsize(path)
+        with open(path, "rb") as file:
+            header = file.read(_HEADER.size)
+            if len(header) < _HEADER.size or header[:4] != LEVEL_MAGIC:
+                raise ValueError(f"{path} - не файл уровня")
+            magic, version, rows, cols, tile_w, tile_h, dtype_code, *table = _HEADER.unpack(header)
+            if not 1 <= version <= LEVEL_VERSION:
+                raise ValueError(f"Уровень {path} версии {version}, поддерживаются версии 1-{LEVEL_VERSION}")
+            sections = {name: (table[i * 2], table[i * 2 + 1]) for i, name in enumerate(_SECTIONS)}
+            for name, (offset, size) in sections.items():
+                # Смещение пустого раздела в конце может указывать за конец файла - читать там нечего
+                if size and offset + size > file_size:
+                    raise ValueError(f"Уровень {path} обрезан: раздел {name} выходит за конец файла")
+
+            try:
+                tile_dtype = np.dtype(dtype_code.rstrip(b"\0").decode("ascii"))
+            except (UnicodeDecodeError, TypeError) as e:
+                raise ValueError(f"Уровень {path}: неизвестный тип сетки тайлов {dtype_code!r}") from e
+            for name, dtype in (("tiles", tile_dtype), ("walk", np.dtype("<f4"))):
+                if sections[name][1] != rows * cols * dtype.itemsize:
+                    raise ValueError(f"Уровень {path}: размер раздела {name} не совпадает с картой {rows}x{cols}")
+
+            def read_section(name: str) -> bytes:
+                offset, size = sections[name]
+                file.seek(offset)
+                return file.read(size)
+
+            tile_types = cls._parse_tile_types(read_section("tile_types"))
+            object_types = cls._parse_strings(read_section("object_types"))
+            records = np.frombuffer(read_section("objects"), dtype=OBJECT_RECORD)
+            params = read_section("params")
+
+        tile_grid = cls._open_grid(path, tile_dtype, sections["tiles"][0], rows, cols, mmap)
+        walk_grid = cls._open_grid(path, np.dtype("<f4"), sections["walk"][0], rows, cols, mmap)
+
+        objects: List[ObjectRecord] = []
+        for i, (type_id, row, col, params_offset, params_size) in enumerate(records.tolist()):
+            if type_id >= len(object_types):
+                raise ValueError(f"Уровень {path}: у объекта {i} неизвестный тип {type_id}")
+            if params_offset + params_size > len(params):
+                raise ValueError(f"Уровень {path}: параметры объекта {i} выходят за раздел params")
+            object_params = json.loads(params[params_offset:params_offset + params_size]) if params_size else {}
+            objects.append((object_types[type_id], row, col, object_params))
+        return cls(rows, cols, (tile_w, tile_h), tile_grid, walk_grid, tile_types, objects)
+
+    @staticmethod
+    def _open_grid(path: str, dtype: np.dtype, offset: int, rows: int, cols: int, mmap: bool) -> np.ndarray:
+        if not rows or not cols:
+            return np.zeros((rows, cols), dtype=dtype)
+        if mmap:
+            return np.memmap(path, dtype=dtype, mode="c", offset=offset, shape=(rows, cols))
+        return np.fromfile(path, dtype=dtype, count=rows * cols, offset=offset).reshape(rows, cols)
+
+    @staticmethod
+    def _parse_tile_types(data: bytes) -> List[TileTypeRecord]:
+        tile_types = []
+        offset = 0
+        while offset < len(data):
+            tile_id, walkable, speed = _TILE_TYPE.unpack_from(data, offset)
+            name, offset = _unpack_string(data, offset + _TILE_TYPE.size)
+            image, offset = _unpack_string(data, offset)
+            tile_types.append((tile_id, name, bool(walkable), speed, image))
+        return tile_types
+
+    @staticmethod
+    def _parse_strings(data: bytes) -> List[str]:
+        strings = []
+        offset = 0
+        while offset < len(data):
+            value, offset = _unpack_string(data, offset)
+            strings.append(value)
+        return strings
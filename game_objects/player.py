@@ -9,10 +9,13 @@ from game_objects.component_transform import TransformComponent
 from game_objects.component_animation import CharacterAnimationComponent
 from game_objects.component_collider import ColliderComponent
 from game_objects.gobject import GameObject
+from game_objects.level_file import register_static_object
 import utils
 
 
 class Player(GameObject):
+    ANIMATION_PATH = "assets/image/GameObjects/Character/Forester"
+
     def __init__(self, map_ref):
         super().__init__("Player")
         self.add_component(TransformComponent())
@@ -20,7 +23,7 @@ class Player(GameObject):
         self.add_component(ColliderComponent(size=(50, 50), stride= 20))
         self.add_component(PlayerControllerComponent(map_ref))
         self.add_component(
-            CharacterAnimationComponent("assets/image/GameObjects/Character/Forester",
+            CharacterAnimationComponent(self.ANIMATION_PATH,
                                         (-75, -180)))
 
     def render(self, surface: pygame.Surface, camera_offset: Optional[pygame.math.Vector2] = None) -> None:
@@ -36,19 +39,25 @@ class Player(GameObject):
             print(f"\r {pos} {iso}", end="")
 
 
+@register_static_object
 class House(GameObject):
+    IMAGE_PATH = "assets/image/GameObjects/Home.png"
+
     def __init__(self):
         super().__init__("House")
         self.add_component(TransformComponent(8, 8))
-        self.add_component(ImageComponent("assets/image/GameObjects/Home.png",
+        self.add_component(ImageComponent(self.IMAGE_PATH,
                                           (-0, -500)))
 
 
+@register_static_object
 class Tree(GameObject):
+    IMAGE_PATH = "assets/image/GameObjects/Tree/Tree.png"
+
     def __init__(self, row = 0, col =0):
         super().__init__("Tree")
         self.add_component(TransformComponent(row, col))
-        self.add_component(ImageComponent("assets/image/GameObjects/Tree/Tree.png",
+        self.add_component(ImageComponent(self.IMAGE_PATH,
                                           (-140, -280)))
         self.add_component(ColliderComponent(size=(50, 50)))
 
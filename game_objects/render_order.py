@@ -0,0 +1,84 @@
+import itertools
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+from uuid import UUID
+
+import pygame
+
+from game_objects.gobject import GameObject
+
+
+class RenderOrder:
+    """
+    Постоянный список объектов карты, упорядоченный по глубине (экранной y).
+    Вместо пересборки и сортировки каждый кадр объекты вставляются один раз,
+    а при перемещении сдвигаются на несколько позиций к своему новому месту.
+    """
+
+    STATIC = 0
+    DYNAMIC = 1
+
+    def __init__(self):
+        # Ключ сортировки: (z, вид объекта, порядковый номер вставки)
+        self._keys: List[Tuple[float, int, int]] = []
+        self._items: List[Tuple[GameObject, 'TransformComponent']] = []
+        self._key_by_id: Dict[UUID, Tuple[float, int, int]] = {}
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, game_object: GameObject) -> bool:
+        return game_object.id in self._key_by_id
+
+    def insert(self, game_object: GameObject, dynamic: bool = False):
+        if game_object in self:
+            return
+        transform = game_object.get_component("transform")
+        kind = self.DYNAMIC if dynamic else self.STATIC
+        key = (transform.screen_position.y, kind, next(self._seq))
+        index = bisect_left(self._keys, key)
+        self._keys.insert(index, key)
+        self._items.insert(index, (game_object, transform))
+        self._key_by_id[game_object.id] = key
+
+    def remove(self, game_object: GameObject):
+        key = self._key_by_id.pop(game_object.id, None)
+        if key is None:
+            return
+        index = bisect_left(self._keys, key)
+        del self._keys[index]
+        del self._items[index]
+
+    def update(self, game_object: GameObject):
+        """Переставляет объект после изменения его позиции"""
+        key = self._key_by_id.get(game_object.id)
+        if key is None:
+            return
+        index = bisect_left(self._keys, key)
+        transform = self._items[index][1]
+        key = (transform.screen_position.y, key[1], key[2])
+        self._keys[index] = key
+        self._key_by_id[game_object.id] = key
+
+        keys, items = self._keys, self._items
+        while index > 0 and keys[index - 1] > key:
+            keys[index], keys[index - 1] = keys[index - 1], keys[index]
+            items[index], items[index - 1] = items[index - 1], items[index]
+            index -= 1
+        while index < len(keys) - 1 and keys[index + 1] < key:
+            keys[index], keys[index + 1] = keys[index + 1], keys[index]
+            items[index], items[index + 1] = items[index + 1], items[index]
+            index += 1
+
+    def visible(self, view_rect: pygame.Rect, margin: int = 0) -> List[GameObject]:
+        """Объекты, чья точка привязки попадает в view_rect (+ margin), в порядке отрисовки"""
+        left, right = view_rect.left - margin, view_rect.right + margin
+        first = bisect_left(self._keys, (view_rect.top - margin,))
+        last = bisect_left(self._keys, (view_rect.bottom + margin, self.DYNAMIC + 1))
+
+        result = []
+        for game_object, transform in self._items[first:last]:
+            if left <= transform.screen_position.x <= right:
+                result.append(game_object)
+        return result
@@ -0,0 +1,157 @@
+import json
+import os
+from typing import Dict, List, Tuple
+
+import pygame
+
+from managers.mngresource import resource_manager
+
+
+ATLAS_VERSION = 1
+
+
+def parse_frame_filename(filename: str) -> Tuple[str, str, str, int]:
+    """Character_state_direction_frame.png -> (character, state, direction, frame)"""
+    name_without_extension: str = filename.rsplit('.', 1)[0]
+    parts: [str] = name_without_extension.split('_')
+    if len(parts) != 4:
+        raise ValueError(f"Неверный формат имени файла {filename}")
+
+    character_name = parts[0]
+    action_type = parts[1]
+    direction = parts[2]
+    frame_number = int(parts[3])
+
+    return character_name, action_type, direction, frame_number
+
+
+class AtlasFrame:
+    """Кадр в атласе: где лежит на листе и насколько сдвинут относительно исходного изображения"""
+
+    def __init__(self, state: str, direction: str, frame: int,
+                 rect: Tuple[int, int, int, int], pivot: Tuple[int, int]):
+        self.state = state
+        self.direction = direction
+        self.frame = frame
+        self.rect = pygame.Rect(rect)
+        # Смещение обрезанного кадра от левого верхнего угла исходного PNG
+        self.pivot = pygame.math.Vector2(pivot)
+
+    def to_dict(self) -> dict:
+        return {"state": self.state, "direction": self.direction, "frame": self.frame,
+                "rect": list(self.rect), "pivot": [int(self.pivot.x), int(self.pivot.y)]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'AtlasFrame':
+        return cls(data["state"], data["direction"], data["frame"], tuple(data["rect"]), tuple(data["pivot"]))
+
+
+class SpriteAtlas:
+    """
+    Кадры персонажа, упакованные в один лист с индексом.
+    Лист (<папка>.atlas.png) и индекс (<папка>.atlas.json) пересобираются,
+    если какой-нибудь исходный PNG в папке новее атласа.
+    """
+
+    def __init__(self, sheet_path: str, sheet: pygame.Surface, frames: List[AtlasFrame]):
+        self.sheet_path = sheet_path
+        self.sheet = sheet
+        self.frames = frames
+
+    @staticmethod
+    def paths(folder: str) -> Tuple[str, str]:
+        folder = os.path.normpath(folder)
+        return f"{folder}.atlas.png", f"{folder}.atlas.json"
+
+    @staticmethod
+    def source_files(folder: str) -> List[str]:
+        return sorted(filename for filename in os.listdir(folder) if filename.endswith(".png"))
+
+    @classmethod
+    def load(cls, folder: str) -> 'SpriteAtlas':
+        """Загружает атлас папки, пересобирая его при необходимости"""
+        sheet_path, index_path = cls.paths(folder)
+        if cls.is_stale(folder):
+            sheet, frames = cls.build(folder)
+            try:
+                cls.save(sheet, frames, sheet_path, index_path)
+            except (OSError, pygame.error) as e:
+                # Нет прав на запись - используем атлас из памяти
+                print(f"Не удалось сохранить атлас {sheet_path}: {e}")
+                return cls(sheet_path, resource_manager.convert(sheet), frames)
+
+        with open(index_path, encoding="utf-8") as file:
+            index = json.load(file)
+        frames = [AtlasFrame.from_dict(data) for data in index["frames"]]
+        return cls(sheet_path, resource_manager.load_image(sheet_path), frames)
+
+    @classmethod
+    def is_stale(cls, folder: str) -> bool:
+        sheet_path, index_path = cls.paths(folder)
+        if not (os.path.exists(sheet_path) and os.path.exists(index_path)):
+            return True
+        try:
+            with open(index_path, encoding="utf-8") as file:
+                index = json.load(file)
+        except (OSError, ValueError):
+            return True
+        if index.get("version") != ATLAS_VERSION or index.get("sources") != cls.source_files(folder):
+            return True
+
+        atlas_time = min(os.path.getmtime(sheet_path), os.path.getmtime(index_path))
+        return any(os.path.getmtime(os.path.join(folder, filename)) > atlas_time
+                   for filename in index["sources"])
+
+    @classmethod
+    def build(cls, folder: str, max_width: int = 2048, padding: int = 0) -> Tuple[pygame.Surface, List[AtlasFrame]]:
+        """Обрезает прозрачные поля кадров и раскладывает их по полкам на одном листе"""
+        pieces = []
+        for filename in cls.source_files(folder):
+            _, state, direction, frame = parse_frame_filename(filename)
+            image = pygame.image.load(os.path.join(folder, filename))
+            bounds = image.get_bounding_rect()
+            if bounds.width == 0 or bounds.height == 0:
+                bounds = pygame.Rect(0, 0, 1, 1)
+            pieces.append((image, bounds, state, direction, frame))
+
+        # Полочная упаковка: сначала высокие кадры
+        pieces.sort(key=lambda piece: piece[1].height, reverse=True)
+        placements = []
+        x = y = shelf_height = sheet_width = 0
+        for piece in pieces:
+            bounds = piece[1]
+            if x > 0 and x + bounds.width > max_width:
+                y += shelf_height + padding
+                x = shelf_height = 0
+            placements.append((x, y))
+            x += bounds.width + padding
+            shelf_height = max(shelf_height, bounds.height)
+            sheet_width = max(sheet_width, x)
+
+        sheet = pygame.Surface((max(1, sheet_width), max(1, y + shelf_height)), pygame.SRCALPHA)
+        sheet.fill((0, 0, 0, 0))
+        frames = []
+        for (image, bounds, state, direction, frame), (px, py) in zip(pieces, placements):
+            sheet.blit(image, (px, py), bounds)
+            frames.append(AtlasFrame(state, direction, frame, (px, py, bounds.width, bounds.height), bounds.topleft))
+        return sheet, frames
+
+    @classmethod
+    def save(cls, sheet: pygame.Surface, frames: List[AtlasFrame], sheet_path: str, index_path: str):
+        folder = sheet_path[:-len(".atlas.png")]
+        pygame.image.save(sheet, sheet_path)
+        index = {"version": ATLAS_VERSION,
+                 "sources": cls.source_files(folder),
+                 "frames": [frame.to_dict() for frame in frames]}
+        with open(index_path, "w", encoding="utf-8") as file:
+            json.dump(index, file, indent=1)
+
+    def frame_surfaces(self) -> Dict[Tuple[str, str], List[Tuple[pygame.Surface, int, pygame.math.Vector2]]]:
+        """(состояние, направление) -> кадры (подповерхность листа, номер, смещение), по порядку номеров"""
+        result: Dict[Tuple[str, str], list] = {}
+        for frame in self.frames:
+            surface = self.sheet.subsurface(frame.rect)
+            result.setdefault((frame.state, frame.direction), []).append((surface, frame.frame, frame.pivot))
+        for frames in result.values():
+            frames.sort(key=lambda item: item[1])
+        return result
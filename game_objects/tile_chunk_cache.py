@@ -0,0 +1,126 @@
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import pygame
+
+import utils
+
+
+class TileChunkCache:
+    """
+    LRU-кэш заранее отрисованных блоков тайлов (чанков).
+    Каждый чанк - это chunk_size x chunk_size тайлов, запечённых в одну поверхность,
+    поэтому за кадр рисуется несколько чанков вместо сотен отдельных тайлов.
+    """
+
+    def __init__(self, map_ref: 'Map', chunk_size: int = 8, max_bytes: int = 64 * 1024 * 1024):
+        self.map_ref = map_ref
+        self.chunk_size = chunk_size
+        self.max_bytes = max_bytes
+
+        # (chunk_row, chunk_col) -> (поверхность, мировая позиция левого верхнего угла)
+        self._chunks: OrderedDict[Tuple[int, int], Tuple[pygame.Surface, pygame.math.Vector2]] = OrderedDict()
+        self._chunk_bytes: Dict[Tuple[int, int], int] = {}
+        self.used_bytes = 0
+
+    @property
+    def chunk_rows(self) -> int:
+        return (self.map_ref.rows + self.chunk_size - 1) // self.chunk_size
+
+    @property
+    def chunk_cols(self) -> int:
+        return (self.map_ref.cols + self.chunk_size - 1) // self.chunk_size
+
+    def chunk_of(self, row: int, col: int) -> Tuple[int, int]:
+        """Возвращает индекс чанка, в который попадает тайл (row, col)"""
+        return row // self.chunk_size, col // self.chunk_size
+
+    def chunk_tiles(self, chunk_row: int, chunk_col: int) -> Tuple[int, int, int, int]:
+        """Диапазон тайлов чанка: (row_start, col_start, row_end, col_end), конец не включается"""
+        r0 = chunk_row * self.chunk_size
+        c0 = chunk_col * self.chunk_size
+        return r0, c0, min(self.map_ref.rows, r0 + self.chunk_size), min(self.map_ref.cols, c0 + self.chunk_size)
+
+    def chunk_world_rect(self, chunk_row: int, chunk_col: int) -> pygame.Rect:
+        """Прямоугольник чанка в мировых (изометрических) координатах, без смещения карты"""
+        r0, c0, r1, c1 = self.chunk_tiles(chunk_row, chunk_col)
+        tile_w, tile_h = self._tile_image_size()
+        left = utils.cart_to_iso(r0, c1 - 1, self.map_ref.tile_size)[0]
+        top = utils.cart_to_iso(r0, c0, self.map_ref.tile_size)[1]
+        right = utils.cart_to_iso(r1 - 1, c0, self.map_ref.tile_size)[0] + tile_w
+        bottom = utils.cart_to_iso(r1 - 1, c1 - 1, self.map_ref.tile_size)[1] + tile_h
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def invalidate(self, row: int, col: int):
+        """Помечает чанк с тайлом (row, col) для повторной отрисовки"""
+        self._drop(self.chunk_of(row, col))
+
+    def invalidate_region(self, row_start: int, col_start: int, row_end: int, col_end: int):
+        """Помечает для повторной отрисовки все чанки, задевающие прямоугольник тайлов"""
+        chunk_r0, chunk_c0 = self.chunk_of(row_start, col_start)
+        chunk_r1, chunk_c1 = self.chunk_of(row_end - 1, col_end - 1)
+        for chunk_row in range(chunk_r0, chunk_r1 + 1):
+            for chunk_col in range(chunk_c0, chunk_c1 + 1):
+                self._drop((chunk_row, chunk_col))
+
+    def invalidate_all(self):
+        self._chunks.clear()
+        self._chunk_bytes.clear()
+        self.used_bytes = 0
+
+    def get_chunk(self, chunk_row: int, chunk_col: int) -> Tuple[pygame.Surface, pygame.math.Vector2]:
+        """Возвращает запечённый чанк, при необходимости отрисовывая его"""
+        key = (chunk_row, chunk_col)
+        chunk = self._chunks.get(key)
+        if chunk:
+            self._chunks.move_to_end(key)
+            return chunk
+
+        chunk = self._bake(chunk_row, chunk_col)
+        self._chunks[key] = chunk
+        surface = chunk[0]
+        self._chunk_bytes[key] = surface.get_bytesize() * surface.get_width() * surface.get_height()
+        self.used_bytes += self._chunk_bytes[key]
+        self._evict(keep=key)
+        return chunk
+
+    def _bake(self, chunk_row: int, chunk_col: int) -> Tuple[pygame.Surface, pygame.math.Vector2]:
+        rect = self.chunk_world_rect(chunk_row, chunk_col)
+        chunk_surface = pygame.Surface(rect.size, pygame.SRCALPHA)
+        if pygame.display.get_surface():
+            chunk_surface = chunk_surface.convert_alpha()
+        chunk_surface.fill((0, 0, 0, 0))
+
+        r0, c0, r1, c1 = self.chunk_tiles(chunk_row, chunk_col)
+        tile_ids = self.map_ref.get_region(r0, c0, r1, c1).tolist()
+        for r in range(r0, r1):
+            row_ids = tile_ids[r - r0]
+            for c in range(c0, c1):
+                tile_type = self.map_ref.tile_types.get(row_ids[c - c0])
+                if tile_type is None or tile_type.surface is None:
+                    continue
+                x, y = utils.cart_to_iso(r, c, self.map_ref.tile_size)
+                chunk_surface.blit(tile_type.surface, (x - rect.x, y - rect.y))
+
+        return chunk_surface, pygame.math.Vector2(rect.topleft)
+
+    def _drop(self, key: Tuple[int, int]):
+        if key in self._chunks:
+            del self._chunks[key]
+            self.used_bytes -= self._chunk_bytes.pop(key)
+
+    def _evict(self, keep: Optional[Tuple[int, int]] = None):
+        """Выгружает давно не использованные чанки, пока не уложимся в лимит памяти"""
+        while self.used_bytes > self.max_bytes and len(self._chunks) > 1:
+            key = next(iter(self._chunks))
+            if key == keep:
+                break
+            self._drop(key)
+
+    def _tile_image_size(self) -> Tuple[int, int]:
+        width, height = self.map_ref.tile_size
+        for tile_type in self.map_ref.tile_types.values():
+            if tile_type.surface:
+                width = max(width, tile_type.surface.get_width())
+                height = max(height, tile_type.surface.get_height())
+        return width, height
@@ -7,6 +7,7 @@ from game_objects.component import Component
 from game_objects.gobject import GameObject
 from game_objects.player import Player
 from game_objects.ground import Map
+from managers.mngresource import resource_manager
 
 
 
@@ -23,7 +24,7 @@ class WorldMap(GameObject):
 
 
     def initialize_world(self):
-        self.surface = pygame.image.load("assets//image//mode_placeholders//res.png")
+        self.surface = resource_manager.load_image("assets//image//mode_placeholders//res.png", alpha=False)
 
 
     def update(self, delta_time: float) -> None:
@@ -0,0 +1,126 @@
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+
+from managers.mngresource import resource_manager
+
+
+class AudioManager:
+    """
+    Звук игры. Длинная музыка читается потоком через pygame.mixer.music, смена трека -
+    затухание текущего и плавное появление следующего. Короткие эффекты загружаются
+    один раз в общий кэш и играют на фиксированном пуле каналов: если свободных нет,
+    вытесняется самый старый звук с наименьшим приоритетом, но не выше приоритета нового.
+    """
+
+    MUSIC = {
+        "menu": "assets/audio/intro-background.mp3",
+        "intro": "assets/audio/Белка в колесе (Hamster Wheel).mp3",
+    }
+    SOUNDS = {
+        "button": "assets/audio/button.mp3",
+    }
+
+    def __init__(self, channels: int = 16, music_volume: float = 0.6, sound_volume: float = 1.0):
+        self.channels_count = channels
+        self.music_volume = music_volume
+        self.sound_volume = sound_volume
+
+        self._sounds: Dict[str, pygame.mixer.Sound] = {}
+        self._channels: List[pygame.mixer.Channel] = []
+        # Для каждого канала: (приоритет, время начала) последнего запущенного звука
+        self._voices: List[Tuple[int, int]] = []
+
+        self.current_music: Optional[str] = None
+        # Трек, который начнётся после затухания текущего: (имя, появление в мс, повторы)
+        self._queued_music: Optional[Tuple[str, int, int]] = None
+
+    @property
+    def enabled(self) -> bool:
+        return pygame.mixer.get_init() is not None
+
+    def _ensure_channels(self) -> bool:
+        if not self.enabled:
+            return False
+        if not self._channels:
+            pygame.mixer.set_num_channels(self.channels_count)
+            self._channels = [pygame.mixer.Channel(i) for i in range(self.channels_count)]
+            self._voices = [(0, 0)] * self.channels_count
+        return True
+
+    def preload(self, *names: str):
+        """Загружает эффекты в кэш; ссылки на них менеджер держит до unload()"""
+        if not self.enabled:
+            return
+        for name in names:
+            if name not in self._sounds:
+                self._sounds[name] = resource_manager.load_sound(self.SOUNDS[name])
+
+    def unload(self, *names: str):
+        for name in names:
+            if self._sounds.pop(name, None) is not None:
+                resource_manager.release_sound(self.SOUNDS[name])
+
+    def play_sound(self, name: str, priority: int = 0, volume: float = 1.0) -> Optional[pygame.mixer.Channel]:
+        """Играет эффект по имени. Возвращает канал или None, если все каналы заняты более важными звуками"""
+        if not self._ensure_channels():
+            return None
+        if name not in self._sounds:
+            self.preload(name)
+
+        index = self._pick_channel(priority)
+        if index is None:
+            return None
+        channel = self._channels[index]
+        channel.set_volume(volume * self.sound_volume)
+        channel.play(self._sounds[name])
+        self._voices[index] = (priority, pygame.time.get_ticks())
+        return channel
+
+    def _pick_channel(self, priority: int) -> Optional[int]:
+        for index, channel in enumerate(self._channels):
+            if not channel.get_busy():
+                return index
+        # Кандидат на вытеснение: наименьший приоритет, среди равных - самый старый
+        index = min(range(len(self._channels)), key=lambda i: self._voices[i])
+        if self._voices[index][0] > priority:
+            return None
+        self._channels[index].stop()
+        return index
+
+    def play_music(self, name: str, fade_ms: int = 1000, loops: int = -1):
+        """Переключает музыку: текущий трек затухает за fade_ms, новый появляется за fade_ms"""
+        if not self.enabled or name == self.current_music:
+            return
+        self.current_music = name
+        if pygame.mixer.music.get_busy():
+            pygame.mixer.music.fadeout(fade_ms)
+            self._queued_music = (name, fade_ms, loops)
+        else:
+            self._start_music(name, fade_ms, loops)
+
+    def stop_music(self, fade_ms: int = 1000):
+        if not self.enabled:
+            return
+        self.current_music = None
+        self._queued_music = None
+        pygame.mixer.music.fadeout(fade_ms)
+
+    def _start_music(self, name: str, fade_ms: int, loops: int):
+        self._queued_music = None
+        try:
+            pygame.mixer.music.load(self.MUSIC[name])
+        except pygame.error as e:
+            print(f"Ошибка загрузки музыки {name}: {e}")
+            self.current_music = None
+            return
+        pygame.mixer.music.set_volume(self.music_volume)
+        pygame.mixer.music.play(loops, fade_ms=fade_ms)
+
+    def update(self):
+        """Запускает следующий трек, когда текущий затух; вызывается раз в кадр"""
+        if self._queued_music and not pygame.mixer.music.get_busy():
+            self._start_music(*self._queued_music)
+
+
+audio_manager = AudioManager()
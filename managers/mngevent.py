@@ -12,3 +12,16 @@ class EventManager:
     def __init__(self):
         self._handlers: Dict[EventType, List[Callable]] = {}
 
+    def subscribe(self, event_type: EventType, handler: Callable) -> None:
+        handlers = self._handlers.setdefault(event_type, [])
+        if handler not in handlers:
+            handlers.append(handler)
+
+    def unsubscribe(self, event_type: EventType, handler: Callable) -> None:
+        handlers = self._handlers.get(event_type)
+        if handlers and handler in handlers:
+            handlers.remove(handler)
+
+    def emit(self, event_type: EventType, *args) -> None:
+        for handler in self._handlers.get(event_type, [])[:]:
+            handler(*args)
@@ -0,0 +1,78 @@
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import pygame
+
+FontKey = Tuple[Optional[str], int, bool, bool]
+
+
+class FontManager:
+    """
+    Общий для процесса реестр шрифтов и LRU-кэш отрисованного текста.
+    Шрифт создаётся один раз на (имя, размер, жирный, курсив): SysFont при первом вызове
+    сканирует системные шрифты, а каждый вызов создаёт новый объект Font.
+    Одинаковые надписи отрисовываются один раз и раздаются как общие поверхности.
+    """
+
+    def __init__(self, max_text_bytes: int = 16 * 1024 * 1024):
+        self._fonts: Dict[FontKey, pygame.font.Font] = {}
+        # Ширины слов в пикселях для каждого шрифта, общие для всех раскладок текста
+        self._word_widths: Dict[FontKey, Dict[str, int]] = {}
+
+        self.max_text_bytes = max_text_bytes
+        self.used_text_bytes = 0
+        # (шрифт, текст, цвет, сглаживание) -> (поверхность, размер в байтах)
+        self._texts: OrderedDict[tuple, Tuple[pygame.Surface, int]] = OrderedDict()
+
+    @staticmethod
+    def font_key(name: Optional[str], size: int, bold: bool = False, italic: bool = False) -> FontKey:
+        return (name.lower() if name else None), size, bold, italic
+
+    def get_font(self, name: Optional[str], size: int, bold: bool = False, italic: bool = False) -> pygame.font.Font:
+        """Системный шрифт по имени; name=None - встроенный шрифт pygame"""
+        key = self.font_key(name, size, bold, italic)
+        font = self._fonts.get(key)
+        if font is None:
+            if name is None:
+                font = pygame.font.Font(None, size)
+                font.set_bold(bold)
+                font.set_italic(italic)
+            else:
+                font = pygame.font.SysFont(name, size, bold, italic)
+            self._fonts[key] = font
+        return font
+
+    def word_widths(self, name: Optional[str], size: int, bold: bool = False, italic: bool = False) -> Dict[str, int]:
+        """Кэш ширин слов шрифта: слово -> ширина; заполняют раскладки текста"""
+        return self._word_widths.setdefault(self.font_key(name, size, bold, italic), {})
+
+    def render_text(self, text: str, name: Optional[str], size: int, color, antialias: bool = True,
+                    bold: bool = False, italic: bool = False) -> pygame.Surface:
+        """
+        Поверхность с текстом из кэша, при промахе отрисовывается шрифтом из реестра.
+        Полученную поверхность нельзя изменять - она общая.
+        """
+        key = (self.font_key(name, size, bold, italic), text, tuple(color), antialias)
+        entry = self._texts.get(key)
+        if entry is not None:
+            self._texts.move_to_end(key)
+            return entry[0]
+
+        surface = self.get_font(name, size, bold, italic).render(text, antialias, color)
+        size_bytes = surface.get_bytesize() * surface.get_width() * surface.get_height()
+        self._texts[key] = (surface, size_bytes)
+        self.used_text_bytes += size_bytes
+        self._evict()
+        return surface
+
+    def clear_text_cache(self):
+        self._texts.clear()
+        self.used_text_bytes = 0
+
+    def _evict(self):
+        while self.used_text_bytes > self.max_text_bytes and len(self._texts) > 1:
+            _, (_, size_bytes) = self._texts.popitem(last=False)
+            self.used_text_bytes -= size_bytes
+
+
+font_manager = FontManager()
@@ -0,0 +1,195 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import perf_counter
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple, Union
+
+import pygame
+
+from managers.mngresource import resource_manager
+
+
+class AssetManifest:
+    """Ресурсы, которые должны быть загружены до входа в сцену"""
+
+    def __init__(self, images: Iterable[Union[str, Tuple[str, bool]]] = (), sounds: Iterable[str] = ()):
+        # (путь, альфа); строка - изображение с альфа-каналом
+        self.images: List[Tuple[str, bool]] = [(item, True) if isinstance(item, str) else tuple(item)
+                                               for item in images]
+        self.sounds: List[str] = list(sounds)
+
+    def __len__(self) -> int:
+        return len(self.images) + len(self.sounds)
+
+    def is_loaded(self) -> bool:
+        return (all(resource_manager.is_loaded(path, alpha) for path, alpha in self.images)
+                and all(resource_manager.is_sound_loaded(path) for path in self.sounds))
+
+
+class ManifestLoad:
+    """
+    Загрузка манифеста. Держит ссылки на загруженные ресурсы, пока не вызван release(),
+    чтобы они не вытеснились до входа в сцену.
+    """
+
+    def __init__(self, manifest: AssetManifest, on_progress: Optional[Callable[[float], None]] = None):
+        self.manifest = manifest
+        self.total = len(manifest)
+        self.loaded = 0
+        self.failed = 0
+        self.on_progress = on_progress
+        self.futures: List[Future] = []
+        self._images: List[Tuple[str, bool]] = []
+        self._sounds: List[str] = []
+        self._released = False
+
+    @property
+    def progress(self) -> float:
+        if not self.total:
+            return 1.0
+        return (self.loaded + self.failed) / self.total
+
+    @property
+    def done(self) -> bool:
+        return self.loaded + self.failed >= self.total
+
+    def _track(self, future: Future, image: Optional[Tuple[str, bool]] = None, sound: Optional[str] = None):
+        def on_done(completed: Future):
+            if completed.exception() is None:
+                self.loaded += 1
+                if image:
+                    self._images.append(image)
+                if sound:
+                    self._sounds.append(sound)
+                if self._released:
+                    self.release()
+            else:
+                self.failed += 1
+            if self.on_progress:
+                self.on_progress(self.progress)
+
+        self.futures.append(future)
+        future.add_done_callback(on_done)
+
+    def release(self):
+        """
+        Отпускает ссылки загрузчика; ресурсы остаются у тех, кто успел их взять.
+        Ресурсы, догруженные после release(), отпускаются сразу.
+        """
+        self._released = True
+        for path, alpha in self._images:
+            resource_manager.release_image(path, alpha)
+        for path in self._sounds:
+            resource_manager.release_sound(path)
+        self._images.clear()
+        self._sounds.clear()
+
+
+class AssetLoader:
+    """
+    Фоновая загрузка ресурсов. Файлы читаются и декодируются в пуле потоков,
+    а приведение к формату экрана и регистрация в resource_manager выполняются
+    в главном потоке в update() небольшими порциями, не дольше convert_budget за кадр.
+    Future разрешаются там же, поэтому их колбэки всегда вызываются в главном потоке.
+    Каждый успешный Future несёт одну ссылку на ресурс, её нужно отпустить через resource_manager.
+    """
+
+    def __init__(self, workers: int = 2, convert_budget: float = 0.002):
+        self.workers = workers
+        self.convert_budget = convert_budget
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Готовые результаты рабочих потоков: (ключ, ресурс, ошибка)
+        self._ready: Deque[tuple] = deque()
+        # Ключ -> ожидающие Future; одинаковые запросы объединяются
+        self._pending: Dict[tuple, List[Future]] = {}
+
+    @property
+    def busy(self) -> bool:
+        return bool(self._pending)
+
+    def load_image(self, path: str, alpha: bool = True) -> Future:
+        if resource_manager.is_loaded(path, alpha):
+            return self._resolved(resource_manager.load_image(path, alpha))
+        return self._request(("image", os.path.normpath(path), alpha), pygame.image.load)
+
+    def load_sound(self, path: str) -> Future:
+        if resource_manager.is_sound_loaded(path):
+            return self._resolved(resource_manager.load_sound(path))
+        return self._request(("sound", os.path.normpath(path)), pygame.mixer.Sound)
+
+    def load_manifest(self, manifest: AssetManifest,
+                      on_progress: Optional[Callable[[float], None]] = None) -> ManifestLoad:
+        load = ManifestLoad(manifest, on_progress)
+        for path, alpha in manifest.images:
+            load._track(self.load_image(path, alpha), image=(path, alpha))
+        for path in manifest.sounds:
+            load._track(self.load_sound(path), sound=path)
+        return load
+
+    def update(self, budget: Optional[float] = None):
+        """Завершает загруженные ресурсы в главном потоке; вызывается раз в кадр"""
+        deadline = perf_counter() + (self.convert_budget if budget is None else budget)
+        while self._ready:
+            self._finish(*self._ready.popleft())
+            if perf_counter() >= deadline:
+                break
+
+    def flush(self):
+        """Дожидается всех запрошенных ресурсов (для замеров и безголовых прогонов)"""
+        while self._pending:
+            if self._ready:
+                self._finish(*self._ready.popleft())
+            else:
+                time.sleep(0.001)
+
+    def shutdown(self):
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    @staticmethod
+    def _resolved(resource) -> Future:
+        future = Future()
+        future.set_result(resource)
+        return future
+
+    def _request(self, key: tuple, decode: Callable) -> Future:
+        future = Future()
+        waiters = self._pending.get(key)
+        if waiters is not None:
+            waiters.append(future)
+            return future
+
+        self._pending[key] = [future]
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="asset-loader")
+        self._executor.submit(self._work, key, decode)
+        return future
+
+    def _work(self, key: tuple, decode: Callable):
+        # Рабочий поток: только чтение и декодирование файла
+        try:
+            self._ready.append((key, decode(key[1]), None))
+        except Exception as e:  # ошибка передаётся в Future, поток не должен падать
+            self._ready.append((key, None, e))
+
+    def _finish(self, key: tuple, resource, error: Optional[Exception]):
+        waiters = self._pending.pop(key, [])
+        if error is not None:
+            print(f"Ошибка загрузки {key[1]}: {error}")
+            for future in waiters:
+                future.set_exception(error)
+            return
+
+        if key[0] == "image":
+            alpha = key[2]
+            resource = resource_manager.add_image(key[1], resource_manager.convert(resource, alpha), alpha,
+                                                  refs=len(waiters))
+        else:
+            resource = resource_manager.add_sound(key[1], resource, refs=len(waiters))
+        for future in waiters:
+            future.set_result(resource)
+
+
+asset_loader = AssetLoader()
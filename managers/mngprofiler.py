@@ -0,0 +1,130 @@
+from collections import deque
+from time import perf_counter
+from typing import Deque, Dict, List, Optional, Tuple
+
+import pygame
+
+from managers.mngfont import font_manager
+
+
+class _Section:
+    """Замер одного участка кадра: with profiler.measure("имя"): ..."""
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: 'Profiler', name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self.profiler.add(self.name, perf_counter() - self.start)
+        return False
+
+
+class _NullSection:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+_NULL_SECTION = _NullSection()
+
+
+class Profiler:
+    """
+    Покадровый профилировщик. Хранит последние history кадров: полное время кадра
+    и суммарное время по участкам (фазы Game, Map.render, update/render классов компонентов).
+    Выключен по умолчанию; в выключенном состоянии замеры сводятся к проверке флага enabled.
+    """
+
+    def __init__(self, history: int = 240):
+        self.enabled = False
+        self.frames: Deque[Tuple[float, Dict[str, float]]] = deque(maxlen=history)
+        self._current: Dict[str, float] = {}
+        self._frame_start = 0.0
+        self._font: Optional[pygame.font.Font] = None
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.frames.clear()
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._current = {}
+        self._frame_start = perf_counter()
+
+    def end_frame(self):
+        if not self.enabled or not self._frame_start:
+            return
+        self.frames.append((perf_counter() - self._frame_start, self._current))
+        self._frame_start = 0.0
+
+    def add(self, name: str, seconds: float):
+        self._current[name] = self._current.get(name, 0.0) + seconds
+
+    def measure(self, name: str):
+        if not self.enabled:
+            return _NULL_SECTION
+        return _Section(self, name)
+
+    def percentiles(self, values=(50, 95, 99)) -> List[float]:
+        """Перцентили времени кадра в миллисекундах"""
+        times = sorted(frame_time for frame_time, _ in self.frames)
+        if not times:
+            return [0.0 for _ in values]
+        return [times[min(len(times) - 1, int(len(times) * p / 100))] * 1000 for p in values]
+
+    def top(self, count: int = 8) -> List[Tuple[str, float]]:
+        """Участки с наибольшим средним временем за кадр, в миллисекундах"""
+        totals: Dict[str, float] = {}
+        for _, sections in self.frames:
+            for name, seconds in sections.items():
+                totals[name] = totals.get(name, 0.0) + seconds
+        frames_count = max(1, len(self.frames))
+        result = [(name, total * 1000 / frames_count) for name, total in totals.items()]
+        result.sort(key=lambda item: item[1], reverse=True)
+        return result[:count]
+
+    def render(self, surface: pygame.Surface, pos: Tuple[int, int] = (10, 10)):
+        """Оверлей: график времени кадра, p50/p95/p99 и самые дорогие участки"""
+        if not self.enabled:
+            return
+        if self._font is None:
+            self._font = font_manager.get_font(None, 20)
+
+        graph_w, graph_h, line_h = 320, 80, 18
+        top = self.top()
+        panel = pygame.Surface((graph_w + 20, graph_h + 40 + line_h * len(top)), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+
+        # График: верх - 33 мс (30 кадров в секунду), жёлтая линия - 16.7 мс
+        scale = graph_h / 33.3
+        budget_y = 10 + graph_h - int(16.7 * scale)
+        pygame.draw.line(panel, (200, 200, 0), (10, budget_y), (10 + graph_w, budget_y))
+        times = [frame_time * 1000 for frame_time, _ in self.frames]
+        if len(times) > 1:
+            step = graph_w / (self.frames.maxlen - 1)
+            points = [(10 + i * step, 10 + graph_h - min(graph_h, t * scale)) for i, t in enumerate(times)]
+            pygame.draw.lines(panel, (0, 255, 0), False, points)
+
+        p50, p95, p99 = self.percentiles()
+        text = f"p50 {p50:.1f} мс  p95 {p95:.1f} мс  p99 {p99:.1f} мс"
+        panel.blit(self._font.render(text, True, (255, 255, 255)), (10, graph_h + 15))
+        for i, (name, ms) in enumerate(top):
+            line = self._font.render(f"{ms:6.2f} мс  {name}", True, (220, 220, 220))
+            panel.blit(line, (10, graph_h + 15 + line_h * (i + 1)))
+
+        surface.blit(panel, pos)
+
+
+profiler = Profiler()
@@ -0,0 +1,135 @@
+import os
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+import pygame
+
+
+class ResourceManager:
+    """
+    Общий для всего процесса кэш изображений и звуков.
+    Каждый файл загружается один раз, приводится к формату экрана и раздаётся
+    как общая поверхность со счётчиком ссылок. Изображения без ссылок выгружаются
+    по принципу LRU, когда суммарный объём превышает бюджет; звуки - сразу.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        # (путь, альфа) -> [поверхность, число ссылок, размер в байтах]
+        self._images: OrderedDict[Tuple[str, bool], list] = OrderedDict()
+        # путь -> [звук, число ссылок]
+        self._sounds: Dict[str, list] = {}
+
+    @staticmethod
+    def _key(path: str, alpha: bool) -> Tuple[str, bool]:
+        return os.path.normpath(path), alpha
+
+    def load_image(self, path: str, alpha: bool = True) -> pygame.Surface:
+        """
+        Возвращает общую поверхность для path и увеличивает число ссылок.
+        alpha=False - для непрозрачных изображений (фоны, интро): быстрый convert() вместо convert_alpha().
+        Полученную поверхность нельзя изменять - она общая.
+        """
+        key = self._key(path, alpha)
+        entry = self._images.get(key)
+        if entry is None:
+            surface = self.convert(pygame.image.load(key[0]), alpha)
+            entry = [surface, 0, surface.get_bytesize() * surface.get_width() * surface.get_height()]
+            self._images[key] = entry
+            self.used_bytes += entry[2]
+        self._images.move_to_end(key)
+        entry[1] += 1
+        self._evict()
+        return entry[0]
+
+    def add_image(self, path: str, surface: pygame.Surface, alpha: bool = True, refs: int = 1) -> pygame.Surface:
+        """
+        Регистрирует уже загруженную и приведённую поверхность (например, от AssetLoader)
+        с refs ссылками. Если файл уже в кэше, возвращается поверхность из кэша.
+        """
+        key = self._key(path, alpha)
+        entry = self._images.get(key)
+        if entry is None:
+            entry = [surface, 0, surface.get_bytesize() * surface.get_width() * surface.get_height()]
+            self._images[key] = entry
+            self.used_bytes += entry[2]
+        self._images.move_to_end(key)
+        entry[1] += refs
+        self._evict()
+        return entry[0]
+
+    def release_image(self, path: str, alpha: bool = True, unload: bool = False):
+        """
+        Уменьшает число ссылок; изображение остаётся в кэше до вытеснения.
+        unload=True - выгрузить сразу, если ссылок не осталось (слайды, которые больше не понадобятся).
+        """
+        key = self._key(path, alpha)
+        entry = self._images.get(key)
+        if entry and entry[1] > 0:
+            entry[1] -= 1
+            if unload and entry[1] == 0:
+                del self._images[key]
+                self.used_bytes -= entry[2]
+            self._evict()
+
+    def is_loaded(self, path: str, alpha: bool = True) -> bool:
+        return self._key(path, alpha) in self._images
+
+    def ref_count(self, path: str, alpha: bool = True) -> int:
+        entry = self._images.get(self._key(path, alpha))
+        return entry[1] if entry else 0
+
+    def load_sound(self, path: str) -> pygame.mixer.Sound:
+        """Возвращает общий звук для path и увеличивает число ссылок"""
+        key = os.path.normpath(path)
+        entry = self._sounds.get(key)
+        if entry is None:
+            entry = [pygame.mixer.Sound(key), 0]
+            self._sounds[key] = entry
+        entry[1] += 1
+        return entry[0]
+
+    def add_sound(self, path: str, sound: pygame.mixer.Sound, refs: int = 1) -> pygame.mixer.Sound:
+        key = os.path.normpath(path)
+        entry = self._sounds.setdefault(key, [sound, 0])
+        entry[1] += refs
+        return entry[0]
+
+    def release_sound(self, path: str):
+        """Уменьшает число ссылок; звук без ссылок выгружается"""
+        key = os.path.normpath(path)
+        entry = self._sounds.get(key)
+        if entry:
+            entry[1] -= 1
+            if entry[1] <= 0:
+                del self._sounds[key]
+
+    def is_sound_loaded(self, path: str) -> bool:
+        return os.path.normpath(path) in self._sounds
+
+    @staticmethod
+    def convert(surface: pygame.Surface, alpha: bool = True) -> pygame.Surface:
+        """Приводит поверхность к формату экрана, если экран уже создан"""
+        if not pygame.display.get_surface():
+            return surface
+        return surface.convert_alpha() if alpha else surface.convert()
+
+    def clear_unused(self):
+        """Выгружает все изображения без ссылок"""
+        for key in [key for key, entry in self._images.items() if entry[1] == 0]:
+            self.used_bytes -= self._images.pop(key)[2]
+
+    def _evict(self):
+        if self.used_bytes <= self.max_bytes:
+            return
+        for key in list(self._images.keys()):
+            if self.used_bytes <= self.max_bytes:
+                break
+            entry = self._images[key]
+            if entry[1] == 0:
+                del self._images[key]
+                self.used_bytes -= entry[2]
+
+
+resource_manager = ResourceManager()
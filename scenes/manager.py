@@ -1,10 +1,14 @@
-from typing import Dict, Optional, List
+from time import perf_counter
+from typing import Callable, Dict, Optional, List, Tuple, Type
 
 import pygame
 
+import settings
+from managers.mngloader import ManifestLoad, asset_loader
 from scenes.scene import Scene
 from scenes.scene_game import GameScene
 from scenes.scene_intro import IntroScene
+from scenes.scene_loading import LoadingScene
 from scenes.scene_mainmenu import MainMenuScene
 
 
@@ -16,7 +20,17 @@ class SceneManager:
 
     def __init__(self, game):
         self.ref_game = game
+        # Созданные сцены
         self.scenes: Dict[str, Scene] = {}
+        # Сцены, которые создаются при первом входе: имя -> (класс, фабрика)
+        self.factories: Dict[str, Tuple[Type[Scene], Callable[['SceneManager'], Scene]]] = {}
+        # Сколько секунд созданная сцена неактивна; после unload_after она выгружается
+        self.unload_after: Optional[float] = settings.scene_unload_after
+        self._inactive_time: Dict[str, float] = {}
+        # Фоновая подготовка сцен: имя -> загрузка манифеста (None - ресурсы уже загружены)
+        self._prewarming: Dict[str, Optional[ManifestLoad]] = {}
+        # Замеренное время создания сцен (сек): фоновое создание ждёт кадра с таким запасом
+        self._build_costs: Dict[str, float] = {}
         self.current_scene: Optional[Scene] = None
         self.previous_scene: Optional[Scene] = None
         self.scene_stack: List[Scene] = []  # Стек для вложенных сцен (например, пауза поверх игры)
@@ -24,23 +38,86 @@ class SceneManager:
         # Регистрация системных сцен
         self._register_system_scenes()
 
+    LOADING_SCENE = "Loading"
+
     def _register_system_scenes(self):
-        self.register_scene(MainMenuScene(self))
-        self.register_scene(IntroScene(self))
-        self.register_scene(GameScene(self))
+        self.register_scene(LoadingScene(self))
+        self.register_factory("Main menu", MainMenuScene)
+        self.register_factory("Intro", IntroScene)
+        self.register_factory("Game", GameScene)
 
     def register_scene(self, scene: Scene) -> None:
         """Регистрация сцены в менеджере"""
         self.scenes[scene.name] = scene
+        self._inactive_time[scene.name] = 0.0
         print(f"Зарегистрирована сцена: {scene.name}")
 
-    def change_scene(self, scene_name: str) -> None:
+    def register_factory(self, scene_name: str, scene_class: Type[Scene],
+                         factory: Optional[Callable[['SceneManager'], Scene]] = None) -> None:
+        """
+        Регистрация сцены, которая будет создана при первом входе.
+        factory(manager) по умолчанию - scene_class(manager); scene_class нужен для манифеста до создания.
+        """
+        self.factories[scene_name] = (scene_class, factory or scene_class)
+
+    def _scene_class(self, scene_name: str) -> Type[Scene]:
+        if scene_name in self.scenes:
+            return type(self.scenes[scene_name])
+        return self.factories[scene_name][0]
+
+    def _build_scene(self, scene_name: str) -> Scene:
+        scene = self.scenes.get(scene_name)
+        if scene is None:
+            start = perf_counter()
+            scene = self.factories[scene_name][1](self)
+            self._build_costs[scene_name] = perf_counter() - start
+            self.register_scene(scene)
+        return scene
+
+    def prewarm(self, scene_name: str) -> None:
+        """
+        Готовит сцену в фоне: загружает её манифест, а затем создаёт сцену в update_prewarming(),
+        когда в кадре остаётся время. Вход в неё потом обходится без экрана загрузки.
+        """
+        if scene_name in self.scenes or scene_name in self._prewarming:
+            return
+        if scene_name not in self.factories:
+            raise ValueError(f"Сцена '{scene_name}' не зарегистрирована")
+        manifest = self._scene_class(scene_name).get_manifest()
+        if manifest and not manifest.is_loaded():
+            self._prewarming[scene_name] = asset_loader.load_manifest(manifest)
+        else:
+            self._prewarming[scene_name] = None
+
+    def unload_scene(self, scene_name: str) -> bool:
+        """Выгружает неактивную сцену, которую можно создать заново фабрикой"""
+        scene = self.scenes.get(scene_name)
+        if (scene is None or scene_name not in self.factories
+                or scene is self.current_scene or scene in self.scene_stack):
+            return False
+        scene.on_unload()
+        del self.scenes[scene_name]
+        self._inactive_time.pop(scene_name, None)
+        print(f"Выгружена сцена: {scene_name}")
+        return True
+
+    def change_scene(self, scene_name: str, wait_for_assets: bool = True) -> None:
         """
          Полная замена текущей сцены на новую.
+         Если манифест сцены ещё не загружен, сначала показывается экран загрузки.
         """
-        if scene_name not in self.scenes:
+        if not self.has_scene(scene_name):
             raise ValueError(f"Сцена '{scene_name}' не зарегистрирована")
-        new_scene = self.scenes[scene_name]
+        manifest = None
+        if wait_for_assets and scene_name != self.LOADING_SCENE:
+            manifest = self._scene_class(scene_name).get_manifest()
+        if manifest and not manifest.is_loaded():
+            # Сцена создаётся после загрузки, пока виден экран загрузки
+            new_scene = self.scenes[self.LOADING_SCENE]
+            new_scene.set_target(scene_name, manifest)
+        else:
+            new_scene = self._build_scene(scene_name)
+        self._inactive_time[new_scene.name] = 0.0
         if self.current_scene:
             self.current_scene.on_exit()
             self.previous_scene = self.current_scene
@@ -56,10 +133,11 @@ class SceneManager:
         Добавление сцены поверх текущей (например, меню паузы).
         Текущая сцена приостанавливается.
         """
-        if scene_name not in self.scenes:
+        if not self.has_scene(scene_name):
             raise ValueError(f"Сцена '{scene_name}' не зарегистрирована")
 
-        new_scene = self.scenes[scene_name]
+        new_scene = self._build_scene(scene_name)
+        self._inactive_time[new_scene.name] = 0.0
 
         if self.current_scene:
             # Приостанавливаем текущую сцену и добавляем в стек
@@ -83,21 +161,55 @@ class SceneManager:
             old_scene.on_exit(self.current_scene)
 
     def get_scene(self, scene_name: str) -> Optional[Scene]:
-        """Получение сцены по имени"""
-        return self.scenes.get(scene_name)
+        """Получение сцены по имени; сцена из фабрики создаётся при первом обращении"""
+        if not self.has_scene(scene_name):
+            return None
+        return self._build_scene(scene_name)
 
     def has_scene(self, scene_name: str) -> bool:
         """Проверка существования сцены"""
-        return scene_name in self.scenes
+        return scene_name in self.scenes or scene_name in self.factories
 
     def handle_events(self, events) -> None:
         if self.current_scene:
             self.current_scene.handle_events(events)
 
     def update(self, delta_time: float) -> None:
-        """Обновление текущей сцены"""
+        """Обновление текущей сцены и выгрузка неактивных сцен"""
         if self.current_scene:
             self.current_scene.update(delta_time)
+        self._update_unloading(delta_time)
+
+    def update_prewarming(self, deadline: float):
+        """
+        Создаёт подготовленную сцену, если до deadline (perf_counter, конец кадра) хватает
+        времени на её создание по прошлому замеру. Вызывается после отрисовки кадра.
+        Если запаса так и не нашлось, сцена создаётся при входе в неё (change_scene).
+        """
+        # Не больше одной сцены за кадр: создание сцены занимает главный поток
+        for scene_name, load in list(self._prewarming.items()):
+            if load is not None and not load.done:
+                continue
+            if scene_name not in self.scenes:
+                cost = self._build_costs.get(scene_name, settings.scene_build_estimate)
+                if deadline - perf_counter() < cost:
+                    return
+                self._build_scene(scene_name)
+            del self._prewarming[scene_name]
+            if load is not None:
+                load.release()
+            return
+
+    def _update_unloading(self, delta_time: float):
+        if self.unload_after is None:
+            return
+        for scene_name, scene in list(self.scenes.items()):
+            if scene is self.current_scene or scene in self.scene_stack:
+                self._inactive_time[scene_name] = 0.0
+                continue
+            self._inactive_time[scene_name] = self._inactive_time.get(scene_name, 0.0) + delta_time
+            if self._inactive_time[scene_name] >= self.unload_after:
+                self.unload_scene(scene_name)
 
     def render(self, surface: pygame.Surface) -> None:
         """Отрисовка текущей сцены"""
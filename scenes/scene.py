@@ -1,10 +1,19 @@
 from abc import ABC, abstractmethod
 from typing import List, Optional, Dict
 
+import pygame
+
+
 class Scene(ABC):
+    # Сцена умеет перерисовывать только изменившиеся области (см. render_dirty)
+    use_dirty_rects = False
+
     def __init__(self, scene_name: str, ref_scene_manager: Optional['SceneManager']):
         self.name = scene_name
         self.ref_scene_manager = ref_scene_manager
+        self.full_redraw = True
+        # Доля шага симуляции, накопленная к отрисовке (задаёт Game при фиксированном шаге)
+        self.interpolation_alpha = 1.0
 
     @abstractmethod
     def on_enter(self): pass  # Подготовка декораций, актеров, реквизита
@@ -22,6 +31,25 @@ class Scene(ABC):
     def handle_events(self, event): pass  # Обработка событий, специфичных для этой сцены.
     # Реакция актеров на действия зрителей
 
+    def on_unload(self):
+        """Освобождает ресурсы и мир перед тем, как SceneManager выгрузит неактивную сцену"""
+        pass
+
+    @classmethod
+    def get_manifest(cls) -> Optional['AssetManifest']:
+        """Ресурсы, которые SceneManager загрузит в фоне (показывая экран загрузки) до входа в сцену"""
+        return None
+
+    def invalidate(self):
+        """Следующий render_dirty перерисует весь экран"""
+        self.full_redraw = True
+
+    def render_dirty(self, surface: pygame.Surface) -> List[pygame.Rect]:
+        """Перерисовывает изменившиеся области и возвращает их для pygame.display.update"""
+        self.render(surface)
+        self.full_redraw = False
+        return [surface.get_rect()]
+
 
 
 
@@ -2,9 +2,14 @@ from typing import List, Optional
 import pygame
 
 import settings
+from game_objects.animation_system import animation_system
 from game_objects.camera import Camera
+from game_objects.chunked_map import ChunkedMap
 from game_objects.gobject import GameObject
 from game_objects.ground import Map
+from game_objects.sprite_atlas import SpriteAtlas
+from managers.mngaudio import audio_manager
+from managers.mngloader import AssetManifest
 from game_objects.player import Player, House, Tree
 from scenes.scene import Scene
 from game_objects.world import WorldMap
@@ -35,17 +40,36 @@ class Romb:
 
 from widgets.frame import FrameWidget
 class GameScene(Scene):
-    def __init__(self, scene_manager):
+    FRAME_IMAGE = "assets/image/ui/frame.png"
+
+    def __init__(self, scene_manager, map_size: Optional[tuple[int, int]] = None, streaming: Optional[bool] = None,
+                 level_path: Optional[str] = None):
         super().__init__("Game", scene_manager)
+        if streaming is None:
+            streaming = settings.world_streaming
+        if level_path is None:
+            level_path = settings.level_path
+        if streaming and level_path:
+            raise ValueError(f"Уровень {level_path} не открывается в чанковом мире: "
+                             f"задайте либо world_streaming, либо level_path")
+        if map_size is None:
+            map_size = settings.world_streaming_size if streaming else (60, 60)
 
         self.frame = FrameWidget(pygame.Rect((100, 100), (500, 500)),"Frame",
-                    "assets/image/ui/frame.png",
+                    self.FRAME_IMAGE,
                     pygame.Rect((10, 10), (90, 104)),
                     pygame.Rect((110, 10), (90, 40)))
 
         self.label = TextLabel("Hello! Здесь предствален большой текст", 200, 600, 600, 250,50)
 
-        self.world = Map(60, 60)
+        if streaming:
+            self.world = ChunkedMap(*map_size, chunk_size=settings.world_chunk_size,
+                                    view_radius=settings.world_view_radius,
+                                    scatter_objects=[(Tree, settings.world_tree_density)])
+        elif level_path:
+            self.world = Map.load(level_path)
+        else:
+            self.world = Map(*map_size)
         self.player: Optional['Player'] = Player(self.world)
 
         self.camera = Camera(0, 0)
@@ -57,14 +81,26 @@ class GameScene(Scene):
         self.l1 = self.l[0].split()
 
         self.world.add_dinamic_object(self.player, 6, 5)
-        self.world.add_static_object(Tree(), 5, 6)
-        self.world.add_static_object(Tree(), 2, 2)
-        self.world.add_static_object(Tree(), 6, 1)
-        self.world.add_static_object(House(), 8, 8)
-
+        if not level_path:
+            self.world.add_static_object(Tree(), 5, 6)
+            self.world.add_static_object(Tree(), 2, 2)
+            self.world.add_static_object(Tree(), 6, 1)
+            self.world.add_static_object(House(), 8, 8)
+        if streaming:
+            self.world.follow(self.camera)
+
+
+    @classmethod
+    def get_manifest(cls) -> AssetManifest:
+        images = [image_path for _, _, _, image_path in Map.TILE_TYPES]
+        images += [Tree.IMAGE_PATH, House.IMAGE_PATH, cls.FRAME_IMAGE]
+        if not SpriteAtlas.is_stale(Player.ANIMATION_PATH):
+            # Устаревший атлас пересобирается синхронно в AnimationLibrary
+            images.append(SpriteAtlas.paths(Player.ANIMATION_PATH)[0])
+        return AssetManifest(images=images)
 
     def on_enter(self) -> None:
-        pass
+        audio_manager.stop_music()
 
     def handle_events(self, event) -> None:
         if event.type == pygame.KEYDOWN:
@@ -75,6 +111,8 @@ class GameScene(Scene):
             self.player.handle_event(event)
 
     def update(self, delta_time: float):
+        animation_system.update(delta_time)
+
         if self.world:
             self.world.update(delta_time)
 
@@ -86,7 +124,8 @@ class GameScene(Scene):
     def render(self, surface: pygame.Surface) -> None:
 
         if self.world:
-            self.world.render(surface, self.camera.offset)
+            self.world.interpolate(self.interpolation_alpha)
+            self.world.render(surface, self.camera.get_render_offset())
 
         if self.camera:
             self.camera.render(surface)
@@ -101,5 +140,11 @@ class GameScene(Scene):
         self.label.render(surface)
 
     def on_exit(self):
+        pass
+
+    def on_unload(self):
         if self.world:
-            del self.world
+            self.world.unload()
+            self.world = None
+        self.player = None
+        self.camera = None
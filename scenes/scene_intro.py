@@ -1,30 +1,84 @@
 import os
+from concurrent.futures import Future
+from typing import List, Optional
+
 import pygame
+from managers.mngaudio import audio_manager
+from managers.mngloader import AssetManifest, asset_loader
+from managers.mngresource import resource_manager
 from scenes.scene import Scene
 
 class IntroScene(Scene):
+    """
+    Слайд-шоу интро. В памяти только текущий слайд и следующий, который заранее
+    декодируется в фоне; после показа слайд сразу выгружается.
+    """
+
+    IMAGES_DIR = "assets/image/intro"
+    # Число ступеней прозрачности при смене слайдов: экран перерисовывается только на новой ступени
+    FADE_STEPS = 32
+    use_dirty_rects = True
+
     def __init__(self, scene_manager):
         super().__init__("Intro", scene_manager)
-        self.images = []
+        self.image_paths: List[str] = []
         self.current_ind = 0
-        self.backgroud_sound = None
+        self.current_image: Optional[pygame.Surface] = None
+        self.next_image: Optional[Future] = None
         self.display_duration = 5  # Максимальная длительность показа картинки
+        self.crossfade_duration = 1.0  # Длительность перехода между картинками
         self.current_display_time = 0
+        self.fade_time: Optional[float] = None  # None - перехода сейчас нет
+        self._drawn_fade_step: Optional[int] = None
+
+    @classmethod
+    def image_files(cls):
+        return [f"{cls.IMAGES_DIR}/{filename}" for filename in sorted(os.listdir(cls.IMAGES_DIR))]
+
+    @classmethod
+    def get_manifest(cls) -> AssetManifest:
+        # Заранее нужен только первый слайд, остальные подгружаются во время показа
+        return AssetManifest(images=[(path, False) for path in cls.image_files()[:1]])
 
     def on_enter(self):
-        for filename in os.listdir("assets/image/intro"):
-            img = pygame.image.load(f"assets/image/intro/{filename}")
-            self.images.append(img)
+        self.image_paths = self.image_files()
+        self.current_ind = 0
+        self.current_display_time = 0
+        self.fade_time = None
+        self.current_image = resource_manager.load_image(self.image_paths[0], alpha=False)
+        self._prefetch_next()
 
-        self.backgroud_sound: pygame.mixer.Sound = pygame.mixer.Sound(
-            "assets/audio/Белка в колесе (Hamster Wheel).mp3")
-        self.backgroud_sound.play()
+        audio_manager.play_music("intro")
+        self.invalidate()
+
+        # Игровая сцена строится, пока идёт интро
+        self.ref_scene_manager.prewarm("Game")
 
     def on_exit(self):
-        self.images.clear()
-        self.backgroud_sound.stop()
+        if self.current_image is not None:
+            self._release(self.current_ind)
+            self.current_image = None
+        if self.next_image is not None:
+            # Слайд, который ещё декодируется, отпускаем, когда он будет готов
+            path = self.image_paths[self.current_ind + 1]
+
+            def release_when_loaded(future: Future):
+                if future.exception() is None:
+                    resource_manager.release_image(path, alpha=False, unload=True)
+
+            self.next_image.add_done_callback(release_when_loaded)
+            self.next_image = None
         self.current_display_time = 0
         self.current_ind = 0
+        self.fade_time = None
+
+    def _prefetch_next(self):
+        index = self.current_ind + 1
+        self.next_image = asset_loader.load_image(self.image_paths[index], alpha=False) \
+            if index < len(self.image_paths) else None
+
+    def _release(self, index: int):
+        resource_manager.release_image(self.image_paths[index], alpha=False, unload=True)
 
     def handle_events(self, event):
         if event.type == pygame.KEYDOWN:
@@ -33,15 +87,50 @@ class IntroScene(Scene):
                 self.ref_scene_manager.change_scene("Game")
 
     def update(self, dt):
+        if self.fade_time is not None:
+            self.fade_time += dt
+            if self.fade_time >= self.crossfade_duration:
+                self._finish_fade()
+            return
+
         self.current_display_time += dt
         if self.current_display_time >= self.display_duration:
-            self.current_display_time = 0
-            if self.current_ind < len(self.images) - 1:
-                self.current_ind += 1
-            else:
+            if self.next_image is None or (self.next_image.done() and self.next_image.exception()):
                 self.ref_scene_manager.change_scene("Game")
+            elif self.next_image.done():
+                self.fade_time = 0.0
+            # Иначе следующий слайд ещё загружается - показываем текущий дольше
 
-    def render(self, surface: pygame.Surface):
-        surface.blit(self.images[self.current_ind], (0, 0))
+    def _finish_fade(self):
+        self._release(self.current_ind)
+        self.current_ind += 1
+        self.current_image = self.next_image.result()
+        self.fade_time = None
+        self.current_display_time = 0
+        self._prefetch_next()
+        self.invalidate()
 
+    def _fade_step(self) -> Optional[int]:
+        if self.fade_time is None:
+            return None
+        return min(self.FADE_STEPS, int(self.fade_time / self.crossfade_duration * self.FADE_STEPS))
+
+    def render(self, surface: pygame.Surface):
+        surface.blit(self.current_image, (0, 0))
+        step = self._fade_step()
+        if step:
+            next_image = self.next_image.result()
+            # Поверхность общая: прозрачность ставим только на время наложения
+            next_image.set_alpha(255 * step // self.FADE_STEPS)
+            surface.blit(next_image, (0, 0))
+            next_image.set_alpha(None)
 
+    def render_dirty(self, surface: pygame.Surface) -> List[pygame.Rect]:
+        step = self._fade_step()
+        if not self.full_redraw and step == self._drawn_fade_step:
+            return []
+        surface.fill((0, 0, 0))
+        self.render(surface)
+        self._drawn_fade_step = step
+        self.full_redraw = False
+        return [surface.get_rect()]
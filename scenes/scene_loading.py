@@ -0,0 +1,56 @@
+from typing import Optional
+
+import pygame
+
+from managers.mngfont import font_manager
+from managers.mngloader import AssetManifest, ManifestLoad, asset_loader
+from scenes.scene import Scene
+
+
+class LoadingScene(Scene):
+    """Экран загрузки: показывает прогресс манифеста целевой сцены и переходит в неё"""
+
+    BAR_SIZE = (600, 24)
+
+    def __init__(self, scene_manager):
+        super().__init__("Loading", scene_manager)
+        self.target_name: Optional[str] = None
+        self.manifest: Optional[AssetManifest] = None
+        self.load: Optional[ManifestLoad] = None
+
+    def set_target(self, scene_name: str, manifest: AssetManifest):
+        self.target_name = scene_name
+        self.manifest = manifest
+
+    def on_enter(self):
+        self.load = asset_loader.load_manifest(self.manifest)
+
+    def on_exit(self):
+        # Выход до окончания загрузки (например, смена сцены поверх экрана загрузки)
+        if self.load is not None:
+            self.load.release()
+            self.load = None
+
+    def handle_events(self, event):
+        pass
+
+    def update(self, dt):
+        if self.load is None or not self.load.done:
+            return
+        load, self.load = self.load, None
+        self.ref_scene_manager.change_scene(self.target_name, wait_for_assets=False)
+        # Целевая сцена уже взяла свои ссылки в on_enter
+        load.release()
+
+    def render(self, surface: pygame.Surface):
+        progress = self.load.progress if self.load else 1.0
+        width, height = self.BAR_SIZE
+        bar = pygame.Rect((0, 0), self.BAR_SIZE)
+        bar.center = surface.get_rect().center
+
+        pygame.draw.rect(surface, (60, 60, 60), bar)
+        pygame.draw.rect(surface, (230, 180, 60), (bar.x, bar.y, int(width * progress), height))
+        pygame.draw.rect(surface, (200, 200, 200), bar, 2)
+
+        text = font_manager.render_text(f"Загрузка... {int(progress * 100)}%", None, 32, (230, 230, 230))
+        surface.blit(text, text.get_rect(midbottom=(bar.centerx, bar.y - 12)))
@@ -1,18 +1,36 @@
+from typing import List, Optional
+
 import pygame
 
+from managers.mngaudio import AudioManager, audio_manager
+from managers.mngloader import AssetManifest
+from managers.mngresource import resource_manager
 from scenes.scene import Scene
 from widgets.button import PushButton
+from widgets.dispatcher import UIDispatcher
 from widgets.layout import Layout, VerticalLayout
 
 
 class MainMenuScene(Scene):
+    BACKGROUND_PATH = "assets/image/mode_placeholders/2.png"
+    use_dirty_rects = True
 
     def __init__(self, scene_manager):
         super().__init__("Main menu", scene_manager)
         self.buttons = []
-        self.backgroud_image = pygame.image.load("assets/image/mode_placeholders/2.png")
+        self.backgroud_image = None
         self.backgroud_sound = None
         self.main_layout = Layout()
+        self.ui_dispatcher = UIDispatcher(self.main_layout)
+        # Фон во весь экран для восстановления областей под изменившимися виджетами
+        self._background_cache: Optional[pygame.Surface] = None
+
+    @classmethod
+    def get_manifest(cls) -> AssetManifest:
+        return AssetManifest(images=[(cls.BACKGROUND_PATH, False),
+                                     "assets/image/ui/btn01_default.png",
+                                     "assets/image/ui/btn01_pressed.png"],
+                             sounds=[AudioManager.SOUNDS["button"]])
 
     def on_enter(self):
         button_start = PushButton((50, 500), (250, 80), "Старт", ui_btn_name="btn01", font_size=36)
@@ -31,16 +49,25 @@ class MainMenuScene(Scene):
 
         self.main_layout.add_child(self.vertical_layout)
 
-        self.backgroud_image = pygame.image.load("assets/image/mode_placeholders/2.png")
+        self.backgroud_image = resource_manager.load_image(self.BACKGROUND_PATH, alpha=False)
+        self.invalidate()
+
+        audio_manager.preload("button")
+        audio_manager.play_music("menu")
+
+        # Пока меню простаивает, готовим следующую сцену
+        self.ref_scene_manager.prewarm("Intro")
 
 
     def on_exit(self):
         del self.vertical_layout
-        del self.backgroud_image
+        resource_manager.release_image(self.BACKGROUND_PATH, alpha=False)
+        self.backgroud_image = None
+        self._background_cache = None
 
 
     def handle_events(self, event):
-        self.main_layout.handle_event(event)
+        self.ui_dispatcher.handle_event(event)
 
     def update(self, dt):
         self.main_layout.update(dt)
@@ -49,4 +76,26 @@ class MainMenuScene(Scene):
         surface.blit(self.backgroud_image, (0, 0))
         self.main_layout.render(surface)
 
+    def render_dirty(self, surface: pygame.Surface) -> List[pygame.Rect]:
+        if (self.full_redraw or self._background_cache is None
+                or self._background_cache.get_size() != surface.get_size()):
+            self._background_cache = pygame.Surface(surface.get_size()).convert()
+            self._background_cache.fill((0, 0, 0))
+            self._background_cache.blit(self.backgroud_image, (0, 0))
+
+            surface.blit(self._background_cache, (0, 0))
+            self.main_layout.render(surface)
+            self.main_layout.collect_dirty_rects()
+            self.full_redraw = False
+            return [surface.get_rect()]
+
+        rects = self.main_layout.collect_dirty_rects()
+        for rect in rects:
+            # Восстанавливаем фон и перерисовываем виджеты только внутри области
+            surface.set_clip(rect)
+            surface.blit(self._background_cache, rect, rect)
+            self.main_layout.render(surface)
+        surface.set_clip(None)
+        return rects
+
 
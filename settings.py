@@ -7,3 +7,21 @@ tile_height = 128
 
 tile_size = (tile_width, tile_height)
 
+# Игровой цикл
+fps = 60
+fixed_timestep = 1 / 60  # шаг симуляции в секундах, None - шаг равен времени кадра
+max_catch_up_steps = 5  # сколько шагов симуляции можно догнать за один кадр
+frame_pacing = "tick"  # tick, uncapped, vsync, busy_loop
+
+# Сцены
+scene_unload_after = 60  # через сколько секунд неактивности выгружать сцену, None - не выгружать
+scene_build_estimate = 0.005  # сколько секунд занимает создание сцены, пока оно ни разу не замерено
+
+# Мир
+world_streaming = False  # чанковый мир: в памяти только чанки вокруг камеры
+world_streaming_size = (100000, 100000)  # размер чанкового мира в тайлах
+world_chunk_size = 16  # сторона чанка мира в тайлах
+world_view_radius = 2  # сколько чанков вокруг камеры держать загруженными
+world_tree_density = 0.02  # доля клеток чанка с деревьями
+level_path = None  # файл уровня для GameScene (Map.save), None - случайная карта
+
@@ -0,0 +1,43 @@
+import pytest
+
+from game_objects.component_transform import Direction
+from game_objects.ground import Map
+from game_objects.player import Player, Tree
+
+
+@pytest.mark.parametrize("direction, tree_cell", [
+    (Direction.S, (6, 6)),
+    (Direction.N, (4, 4)),
+    (Direction.E, (6, 4)),
+    (Direction.W, (4, 6)),
+])
+def test_character_stops_at_tree(direction, tree_cell):
+    game_map = Map(12, 12)
+    game_map.walk_grid[:] = 1
+    tree = Tree()
+    game_map.add_static_object(tree, *tree_cell)
+    player = Player(game_map)
+    game_map.add_dinamic_object(player, 5, 5)
+
+    controller = player.get_component("controller")
+    transform = player.get_component("transform")
+    collider = player.get_component("collider")
+    tree_bounds = tree.get_component("collider").get_bounds().copy()
+
+    controller.set_direction(direction)
+    controller.move()
+    start = transform.screen_position.copy()
+    for _ in range(240):
+        # Шаг контроллера проверяется до того, как CollisionSystem карты растолкнёт пересечения
+        player.update(1 / 60)
+        assert not collider.get_bounds().colliderect(tree_bounds)
+        game_map.collision_system.update()
+
+    position = transform.screen_position
+    # Дошёл до дерева и остановился, не соскользнув вбок
+    assert position != start
+    if direction.to_vector().x == 0:
+        assert position.x == start.x
+    else:
+        assert position.y == start.y
+    assert collider.get_bounds().inflate(8, 8).colliderect(tree_bounds)
@@ -0,0 +1,79 @@
+import os
+import struct
+
+import numpy as np
+import pytest
+
+from game_objects.level_file import LEVEL_VERSION, OBJECT_RECORD, LevelFile, _HEADER, _SECTIONS
+
+# Смещение поля версии в заголовке: после 4 байт магии
+VERSION_OFFSET = 4
+
+
+@pytest.fixture
+def level_path(tmp_path):
+    tile_grid = np.arange(6 * 5, dtype=np.uint8).reshape(6, 5)
+    walk_grid = np.ones((6, 5), dtype=np.float32)
+    walk_grid[2, 3] = 0
+    tile_types = [(0, "Grass", True, 1.0, "assets/image/Ground/Grass_3.png"),
+                  (1, "Water", False, 0.5, None)]
+    objects = [("Tree", 1, 2, {}), ("House", 4, 0, {"name": "Дом"})]
+    path = str(tmp_path / "level.lvl")
+    LevelFile(6, 5, (256, 128), tile_grid, walk_grid, tile_types, objects).write(path)
+    return path
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_round_trip(level_path, mmap):
+    level = LevelFile.read(level_path, mmap)
+    assert (level.rows, level.cols, level.tile_size) == (6, 5, (256, 128))
+    assert level.tile_grid.dtype == np.uint8
+    np.testing.assert_array_equal(level.tile_grid, np.arange(30, dtype=np.uint8).reshape(6, 5))
+    assert level.walk_grid[2, 3] == 0 and level.walk_grid.sum() == 29
+    assert level.tile_types == [(0, "Grass", True, 1.0, "assets/image/Ground/Grass_3.png"),
+                                (1, "Water", False, 0.5, None)]
+    assert level.objects == [("Tree", 1, 2, {}), ("House", 4, 0, {"name": "Дом"})]
+
+
+def patch(path: str, offset: int, data: bytes):
+    with open(path, "r+b") as file:
+        file.seek(offset)
+        file.write(data)
+
+
+def test_bad_magic(level_path):
+    patch(level_path, 0, b"XXXX")
+    with pytest.raises(ValueError):
+        LevelFile.read(level_path)
+
+
+@pytest.mark.parametrize("version", [0, LEVEL_VERSION + 1])
+def test_unsupported_version(level_path, version):
+    patch(level_path, VERSION_OFFSET, struct.pack("<H", version))
+    with pytest.raises(ValueError):
+        LevelFile.read(level_path)
+
+
+def object_field_offset(path: str, index: int, field: str) -> int:
+    """Смещение в файле поля field записи объекта index"""
+    with open(path, "rb") as file:
+        table = _HEADER.unpack(file.read(_HEADER.size))[7:]
+    section_offset = table[_SECTIONS.index("objects") * 2]
+    return section_offset + index * OBJECT_RECORD.itemsize + OBJECT_RECORD.fields[field][1]
+
+
+@pytest.mark.parametrize("field, value", [
+    ("type", struct.pack("<H", 99)),  # типов объектов в уровне два
+    ("params_size", struct.pack("<I", 10 ** 6)),  # за концом раздела params
+], ids=["type", "params_size"])
+def test_corrupted_object_record(level_path, field, value):
+    patch(level_path, object_field_offset(level_path, 1, field), value)
+    with pytest.raises(ValueError):
+        LevelFile.read(level_path)
+
+
+def test_truncated_file(level_path):
+    with open(level_path, "r+b") as file:
+        file.truncate(os.path.getsize(level_path) - 1)
+    with pytest.raises(ValueError):
+        LevelFile.read(level_path)
@@ -0,0 +1,50 @@
+import pytest
+
+from game_objects.chunked_map import ChunkedMap
+from game_objects.ground import Map
+from game_objects.player import House, Tree
+
+
+@pytest.mark.parametrize("make_map", [
+    lambda: Map(12, 12),
+    lambda: ChunkedMap(32, 32, chunk_size=8),
+])
+def test_object_on_occupied_cell_replaces_old_one(make_map):
+    game_map = make_map()
+    old = Tree()
+    new = House()
+    game_map.add_static_object(old, 3, 4)
+    old_collider = old.get_component("collider")
+    bounds = old_collider.get_bounds().copy()
+    game_map.add_static_object(new, 3, 4)
+
+    assert game_map.get_static_object(3, 4) is new
+    assert old not in game_map.all_static_objects
+    assert new in game_map.all_static_objects
+    assert old_collider not in game_map.colliders_near(bounds)
+    # Старый объект уничтожен - компоненты отсоединены
+    assert old.get_component("transform") is None
+
+
+def test_chunked_map_refuses_level_files(tmp_path):
+    path = str(tmp_path / "level.lvl")
+    game_map = ChunkedMap(32, 32, chunk_size=8)
+    assert not game_map.persistent
+    with pytest.raises(ValueError):
+        game_map.save(path)
+
+    Map(4, 4).save(path)
+    with pytest.raises(ValueError):
+        ChunkedMap.load(path)
+
+
+def test_saved_map_keeps_only_replacing_object(tmp_path):
+    game_map = Map(12, 12)
+    game_map.add_static_object(Tree(), 3, 4)
+    game_map.add_static_object(Tree(), 3, 4)
+    path = str(tmp_path / "level.lvl")
+    game_map.save(path)
+
+    loaded = Map.load(path)
+    assert len(loaded.all_static_objects) == 1
+    assert loaded.get_static_object(3, 4).name == "Tree"
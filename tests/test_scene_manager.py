@@ -0,0 +1,37 @@
+import contextlib
+import io
+from time import perf_counter
+
+from game import Game
+from managers.mngloader import asset_loader
+
+
+def make_game() -> Game:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return Game(320, 240, name="Test")
+
+
+def test_prewarm_waits_for_frame_slack():
+    game = make_game()
+    manager = game.scene_manager
+    manager.prewarm("Intro")
+    asset_loader.flush()
+
+    # Кадр уже исчерпан - сцена не создаётся
+    manager.update_prewarming(perf_counter())
+    assert "Intro" not in manager.scenes
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager.update_prewarming(perf_counter() + 1)
+    assert "Intro" in manager.scenes
+
+
+def test_prewarmed_scene_is_built_on_enter_without_slack():
+    game = make_game()
+    manager = game.scene_manager
+    manager.prewarm("Intro")
+    asset_loader.flush()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager.change_scene("Intro")
+    assert manager.current_scene.name == "Intro"
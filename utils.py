@@ -1,3 +1,5 @@
+import math
+
 import settings
 
 
@@ -11,8 +13,55 @@ def z_stack_value(row, col, tile_size: tuple[int, int] = settings.tile_size) ->
 
 def iso_to_cart(x, y, tile_size: tuple[int, int]= settings.tile_size) ->tuple[int, int]:
     "tile size: 1arg width 2arg height"
+    row, col = iso_to_cart_float(x, y, tile_size)
+    return round(row), round(col)
+
+def iso_to_cart_float(x, y, tile_size: tuple[int, int] = settings.tile_size) -> tuple[float, float]:
+    """То же, что iso_to_cart, но без округления до номера тайла"""
     row = y / tile_size[1] + x / tile_size[0]
     col = y / tile_size[1] - x / tile_size[0]
-    return round(row), round(col)
+    return row, col
+
+def visible_tile_spans(view_rect, rows: int, cols: int,
+                       tile_size: tuple[int, int] = settings.tile_size) -> list[tuple[int, int, int]]:
+    """
+    Отсечение по видимой области в изометрии.
+    view_rect - прямоугольник экрана в мировых координатах (центр тайла - cart_to_iso(row, col)).
+    Возвращает список (row, col_start, col_end) для строк, ромбы которых пересекают экран.
+    """
+    left, top = view_rect[0], view_rect[1]
+    right, bottom = left + view_rect[2], top + view_rect[3]
+
+    # Углы экрана в декартовых координатах карты
+    row_tl, _ = iso_to_cart_float(left, top, tile_size)
+    row_tr, col_tr = iso_to_cart_float(right, top, tile_size)
+    row_bl, col_bl = iso_to_cart_float(left, bottom, tile_size)
+    row_br, _ = iso_to_cart_float(right, bottom, tile_size)
+
+    # Экран в координатах карты - повёрнутый прямоугольник:
+    # row - col лежит в [diff_min, diff_max], row + col в [sum_min, sum_max]
+    diff_max, sum_min = row_tr - col_tr, row_tr + col_tr
+    diff_min, sum_max = row_bl - col_bl, row_bl + col_bl
+
+    spans = []
+    first_row = max(0, math.ceil(row_tl - 0.5))
+    last_row = min(rows - 1, math.floor(row_br + 0.5))
+    for row in range(first_row, last_row + 1):
+        # Часть полосы строки (row +- 0.5), попадающая в экран
+        lo = max(row - 0.5, row_tl)
+        hi = min(row + 0.5, row_br)
+        if lo > hi:
+            continue
+        # Нижняя граница col минимальна у правого верхнего угла, верхняя максимальна у левого нижнего
+        u = min(max(row_tr, lo), hi)
+        col_min = max(u - diff_max, sum_min - u)
+        u = min(max(row_bl, lo), hi)
+        col_max = min(u - diff_min, sum_max - u)
+
+        col_start = max(0, math.ceil(col_min - 0.5))
+        col_end = min(cols, math.floor(col_max + 0.5) + 1)
+        if col_start < col_end:
+            spans.append((row, col_start, col_end))
+    return spans
 
 
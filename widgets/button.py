@@ -1,12 +1,20 @@
 import os.path
-from typing import Callable, Tuple
+from typing import Callable, Optional, Tuple
 
 import pygame
 import pygame.event
+from managers.mngaudio import audio_manager
+from managers.mngfont import font_manager
+from managers.mngresource import resource_manager
 from widgets.widget import Widget
 
 
 class PushButton(Widget):
+    interactive = True
+    # Звуки из AudioManager.SOUNDS; None - без звука
+    hover_sound: Optional[str] = "button"
+    click_sound: Optional[str] = "button"
+
     def __init__(self,
                  pos: tuple[int, int],
                  size: tuple[int, int],
@@ -33,6 +41,7 @@ class PushButton(Widget):
 
         self.is_pressed = False
         self.is_hover = False
+        self.is_hovered = False
         self.is_updated = False
 
         self._init_data(ui_btn_name)
@@ -42,8 +51,8 @@ class PushButton(Widget):
         path_ui_btn_pressed = f"assets/image/ui/{ui_btn_name}_pressed.png"
 
         if os.path.exists(path_ui_btn_default):
-            self.default_surface = pygame.image.load(path_ui_btn_default).convert_alpha()
-            self.pressed_surface = pygame.image.load(path_ui_btn_pressed).convert_alpha()
+            self.default_surface = resource_manager.load_image(path_ui_btn_default)
+            self.pressed_surface = resource_manager.load_image(path_ui_btn_pressed)
 
             if self.is_convert_image_to_orig_size and self.default_surface and self.pressed_surface:
                 self.default_surface = pygame.transform.scale(self.default_surface, self.rect)
@@ -55,11 +64,12 @@ class PushButton(Widget):
             self.is_image = False
 
         self.surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        self.invalidate_masks()
 
         if self.text:
             # Загружаем шрифт и создаем текстовую поверхность (изображение с текстом)
-            self.font = pygame.font.SysFont(self.font_name, self.font_size)
-            self.text_surface = self.font.render(self.text, True, self.font_color)  # (0,0,0) - Черный цвет
+            self.font = font_manager.get_font(self.font_name, self.font_size)
+            self.text_surface = font_manager.render_text(self.text, self.font_name, self.font_size, self.font_color)
 
     def _update_surface(self, dt: float):
         if self.is_image:
@@ -92,6 +102,9 @@ class PushButton(Widget):
                 text_rect.center = surface_rect.center
                 self.surface.blit(self.text_surface, text_rect)
         self.is_updated = True
+        # Маска кэшируется отдельно для обычного и нажатого вида
+        self.surface_state = self.is_pressed
+        self.mark_dirty()
 
     def up(self):  #Метод срабатывает когда мы отпускаем кнопку
         """Вызывается при отпускании ЛКМ над кнопкой"""
@@ -99,6 +112,8 @@ class PushButton(Widget):
         # Здесь обычно вызывают какое-то действие (callback)
         self.is_pressed = False
         self.is_updated = False
+        if self.click_sound:
+            audio_manager.play_sound(self.click_sound, priority=1)
         if self.on_click:
             self.on_click()
 
@@ -112,7 +127,11 @@ class PushButton(Widget):
         """Вызывается, когда курсор впервые попадает на кнопку"""
         self.is_updated = False
         print(f"Курсор над кнопкой '{self.text}'")
-        # Позже сюда можно добавить звук или анимацию
+        if self.hover_sound:
+            audio_manager.play_sound(self.hover_sound, volume=0.5)
+
+    def on_mouse_leave(self):
+        self.is_hovered = False
 
     def handle_event(self, event: pygame.event.Event) -> bool:
         if event.type == pygame.MOUSEMOTION:
@@ -123,6 +142,7 @@ class PushButton(Widget):
                     if not self.is_hovered:
                         self.hover()  # только при входе в область
                     self.is_hovered = True
+                    return True
             else:
                 self.is_hovered = False
 
@@ -130,11 +150,14 @@ class PushButton(Widget):
             if event.button == 1 and self.is_hovered:  # ЛКМ
                 if self.collide_point_with_mask(event.pos):
                     self.down()
+                    return True
 
         elif event.type == pygame.MOUSEBUTTONUP:
             if event.button == 1:
                 if self.is_pressed and self.is_hovered:
                     self.up()  # кнопка была нажата И отпущена над ней
+                    return True
+        return False
 
     def render(self, surface: pygame.Surface) -> None:
         surface.blit(self.surface, self.get_absolute_rect())
@@ -0,0 +1,67 @@
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+
+from widgets.layout import Layout
+from widgets.widget import Widget
+
+
+MOUSE_EVENTS = (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+
+
+class UIDispatcher:
+    """
+    Доставка событий дереву виджетов. События мыши получает только виджет под курсором:
+    он ищется через сетку экранных ячеек по интерактивным виджетам, сверху вниз по порядку
+    отрисовки. Остальные события передаются корню как раньше, до первого обработавшего.
+    """
+
+    def __init__(self, root: Layout, cell_size: int = 128):
+        self.root = root
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], List[Widget]] = {}
+        self._indexed_version = -1
+
+        self.hovered: Optional[Widget] = None
+
+    def rebuild(self):
+        """Перестраивает индекс по текущим абсолютным прямоугольникам виджетов"""
+        self._cells.clear()
+        size = self.cell_size
+        for widget in self.root.iter_widgets():
+            if not widget.interactive:
+                continue
+            rect = widget.get_absolute_rect()
+            if rect.width <= 0 or rect.height <= 0:
+                continue
+            for cx in range(rect.left // size, (rect.right - 1) // size + 1):
+                for cy in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                    self._cells.setdefault((cx, cy), []).append(widget)
+        self._indexed_version = Widget.layout_version
+
+    def widget_at(self, pos: Tuple[int, int]) -> Optional[Widget]:
+        """Верхний интерактивный виджет под точкой"""
+        self.root.ensure_layout()
+        if self._indexed_version != Widget.layout_version:
+            self.rebuild()
+        candidates = self._cells.get((pos[0] // self.cell_size, pos[1] // self.cell_size))
+        if not candidates:
+            return None
+        for widget in reversed(candidates):
+            if widget.hit_test(pos):
+                return widget
+        return None
+
+    def handle_event(self, event: pygame.event.Event) -> bool:
+        if event.type not in MOUSE_EVENTS:
+            return bool(self.root.handle_event(event))
+
+        target = self.widget_at(event.pos)
+        if event.type == pygame.MOUSEMOTION and target is not self.hovered:
+            if self.hovered is not None:
+                self.hovered.on_mouse_leave()
+            self.hovered = target
+
+        if target is None:
+            return False
+        return bool(target.handle_event(event))
@@ -1,9 +1,72 @@
 import pygame
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 
+from managers.mngresource import resource_manager
 from widgets.widget import Widget
 
 
+class FramePieces:
+    """
+    Куски рамки, вырезанные из спрайта один раз: верхняя линия, повёрнутая боковая
+    и четыре отражённых уголка. Общие для всех рамок с тем же спрайтом и разметкой.
+    """
+
+    _cache: Dict[tuple, 'FramePieces'] = {}
+
+    def __init__(self, sprite_surface: pygame.Surface, corner_rect: pygame.Rect, edge_rect: pygame.Rect):
+        self.corner_size = corner_rect.size
+        self.top_edge = sprite_surface.subsurface(edge_rect).copy()
+        self.left_edge = pygame.transform.rotate(self.top_edge, -90)
+
+        corner = sprite_surface.subsurface(corner_rect).copy()
+        self.top_left = corner
+        self.top_right = pygame.transform.flip(corner, True, False)
+        self.bottom_left = pygame.transform.flip(corner, False, True)
+        self.bottom_right = pygame.transform.flip(corner, True, True)
+
+    @classmethod
+    def get(cls, sprite_path: str, sprite_surface: pygame.Surface,
+            corner_rect: pygame.Rect, edge_rect: pygame.Rect) -> 'FramePieces':
+        key = (sprite_path, tuple(corner_rect), tuple(edge_rect))
+        pieces = cls._cache.get(key)
+        if pieces is None:
+            pieces = cls(sprite_surface, corner_rect, edge_rect)
+            cls._cache[key] = pieces
+        return pieces
+
+    def bake(self, size: Tuple[int, int], fill_color=None) -> pygame.Surface:
+        """Собирает рамку размера size (и заливку внутри неё) в одну поверхность"""
+        w, h = size
+        corner_w, corner_h = self.corner_size
+        edge_w, edge_h = self.top_edge.get_size()
+        surface = pygame.Surface((max(1, w), max(1, h)), pygame.SRCALPHA)
+
+        if fill_color:
+            surface.fill(fill_color, pygame.Rect(edge_h, edge_h, w - 2 * edge_h, h - 2 * edge_h))
+
+        for i in range(corner_w, w - corner_w, edge_w):
+            # Рисуем сверху
+            surface.blit(self.top_edge, (i, 0))
+            # Рисуем снизу
+            surface.blit(self.top_edge, (i, h - edge_h))
+
+        # Левая и правая линии
+        left_w, left_h = self.left_edge.get_size()
+        for i in range(corner_h, h - corner_h, left_h):
+            surface.blit(self.left_edge, (0, i - 20))
+            surface.blit(self.left_edge, (w - left_w, i - 20))
+
+        surface.blit(self.top_left, (0, 0))
+        surface.blit(self.top_right, (w - corner_w, 0))
+        surface.blit(self.bottom_left, (0, h - corner_h))
+        surface.blit(self.bottom_right, (w - corner_w, h - corner_h))
+
+        # RLE пропускает прозрачную середину рамки при отрисовке
+        surface = resource_manager.convert(surface)
+        surface.set_alpha(255, pygame.RLEACCEL)
+        return surface
+
+
 class FrameWidget(Widget):
 
     def __init__(
@@ -13,51 +76,53 @@ class FrameWidget(Widget):
         sprite_path: str = "",
         corner_rect: pygame.Rect = None,  # Прямоугольник уголка на спрайте
         edge_rect: pygame.Rect = None,    # Прямоугольник линии на спрайте
+        fill_color: Optional[Tuple[int, int, int, int]] = None,  # Заливка внутри рамки
     ):
         super().__init__(name)
         self.rect = rect
-        self.sprite_surface = pygame.image.load(sprite_path).convert_alpha()
+        self.fill_color = fill_color
+        self.sprite_path = ""
+        self.sprite_surface: Optional[pygame.Surface] = None
+        self._pieces: Optional[FramePieces] = None
 
-        self.corner_rect = corner_rect  # pygame.Rect для уголка
-        self.edge_rect = edge_rect  # pygame.Rect для линии рамки
+        # Собранная рамка и размер, для которого она собрана
+        self._baked: Optional[pygame.Surface] = None
+        self._baked_size: Optional[Tuple[int, int]] = None
 
-    def render(self, surface: pygame.Surface) -> None:
-        if not self.sprite_surface or not self.corner_rect or not self.edge_rect:
-            return
+        self.set_sprite(sprite_path, corner_rect, edge_rect)
+
+    def set_sprite(self, sprite_path: str, corner_rect: pygame.Rect, edge_rect: pygame.Rect):
+        if self.sprite_path:
+            resource_manager.release_image(self.sprite_path)
+        self.sprite_path = sprite_path
+        self.sprite_surface = resource_manager.load_image(sprite_path)
 
-        corner_w, corner_h = self.corner_rect.size
-        edge_w, edge_h = self.edge_rect.size
+        self.corner_rect = corner_rect  # pygame.Rect для уголка
+        self.edge_rect = edge_rect  # pygame.Rect для линии рамки
 
+        self._pieces = None
+        if self.sprite_surface and self.corner_rect and self.edge_rect:
+            self._pieces = FramePieces.get(sprite_path, self.sprite_surface, self.corner_rect, self.edge_rect)
+        self._baked = None
+        self.mark_dirty()
 
-        top_edge = self.sprite_surface.subsurface(self.edge_rect)
-        x, y, w, h = self.rect
+    def set_fill_color(self, fill_color: Optional[Tuple[int, int, int, int]]):
+        self.fill_color = fill_color
+        self._baked = None
+        self.mark_dirty()
 
-        top_edge = self.sprite_surface.subsurface(self.edge_rect)
-        for i in range(x + corner_w, x + w - corner_w, edge_w):
-            # Рисуем сверху
-            surface.blit(top_edge, (i, y))
-            # Рисуем снизу
-            surface.blit(top_edge, (i, y + h - edge_h))
+    def get_composed_surface(self) -> Optional[pygame.Surface]:
+        if self._pieces is None:
+            return None
+        if self._baked is None or self._baked_size != self.rect.size:
+            self._baked = self._pieces.bake(self.rect.size, self.fill_color)
+            self._baked_size = self.rect.size
+        return self._baked
 
-        # Левая и правая линии
-        left_edge = pygame.transform.rotate(top_edge, -90)
-        left_edge_rect = left_edge.get_rect()
-        for i in range(y + corner_h, y + h - corner_h, left_edge_rect.height):
-            surface.blit(left_edge, (x, i-20))
-            surface.blit(left_edge, (x + w - left_edge_rect.width, i-20))
-
-
-        # Левый верхний
-        surface.blit(self.sprite_surface, (x, y), self.corner_rect)
-        # Правый верхний
-        flipped_corner = pygame.transform.flip(self.sprite_surface.subsurface(self.corner_rect), True, False)
-        surface.blit(flipped_corner, (x + w - corner_w, y))
-        # Левый нижний
-        flipped_corner = pygame.transform.flip(self.sprite_surface.subsurface(self.corner_rect), False, True)
-        surface.blit(flipped_corner, (x, y + h - corner_h))
-        # Правый нижний
-        flipped_corner = pygame.transform.flip(self.sprite_surface.subsurface(self.corner_rect), True, True)
-        surface.blit(flipped_corner, (x + w - corner_w, y + h - corner_h))
+    def render(self, surface: pygame.Surface) -> None:
+        baked = self.get_composed_surface()
+        if baked is not None:
+            surface.blit(baked, self.rect.topleft)
 
     def handle_event(self, event: pygame.event.Event) -> bool:
         return True
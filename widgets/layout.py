@@ -1,47 +1,149 @@
-from typing import List, Optional
+from typing import List, Optional, Set
 import pygame
 
 from widgets.widget import Widget
 
 class Layout(Widget):
+    """
+    Контейнер с сохраняемым состоянием. Компоновка откладывается до ensure_layout()
+    (один проход за кадр перед отрисовкой или поиском виджета под курсором), а фон
+    и дочерние виджеты собираются в кэшированную поверхность, в которой
+    перекомпонуются только области изменившихся детей.
+    """
+
     def __init__(self):
         super().__init__()
         self.children: List[Widget] = []
         self.spacing = 30  # Расстояние между элементами
 
+        self._needs_layout = False
+        self._needs_compose = True
+        self._dirty_children: Set[Widget] = set()
+        # Область, которую занимают фон и дети, в координатах layout'а
+        self._content_rect = pygame.Rect(0, 0, 0, 0)
+        self._composed: Optional[pygame.Surface] = None
+
 
     def add_child(self, child):
         child.parent = self
         self.children.append(child)
-        self._update_layout()
+        self.request_layout()
+        self.mark_dirty()
 
     def remove_child(self, child: Widget) -> None:
         """Удаление дочернего виджета"""
         if child in self.children:
             child.parent = None
             self.children.remove(child)
-            self._update_layout()
-
-
+            self._dirty_children.discard(child)
+            child.invalidate_rect()
+            self.request_layout()
+            self.mark_dirty()
+
+    def request_layout(self):
+        """Помечает layout и его предков для пересчёта в следующем ensure_layout()"""
+        self._needs_layout = True
+        if self.parent is not None:
+            self.parent.request_layout()
+
+    def ensure_layout(self):
+        """Отложенный проход компоновки: пересчитывает только помеченные ветви"""
+        if not self._needs_layout:
+            return
+        for child in self.children:
+            if isinstance(child, Layout):
+                child.ensure_layout()
+        self._update_layout()
+        self._content_rect = self._compute_content_rect()
+        self._needs_layout = False
+        self._needs_compose = True
+        self.invalidate_rect()
 
     def _update_layout(self) -> None:
         """Обновление компоновки - должен быть реализован в дочерних классах"""
         pass
 
+    def _compute_content_rect(self) -> pygame.Rect:
+        content = pygame.Rect((0, 0), self.rect.size)
+        for child in self.children:
+            content.union_ip(child.get_extent())
+        return content
+
+    def child_changed(self, child: Widget):
+        """Вид ребёнка изменился: его область перекомпонуется, изменение поднимается к предкам"""
+        self._dirty_children.add(child)
+        if self.parent is not None:
+            self.parent.child_changed(self)
+
+    def get_extent(self) -> pygame.Rect:
+        return self._content_rect.move(self.rect.topleft)
+
+    def get_drawn_rect(self) -> pygame.Rect:
+        return self._content_rect.move(self.get_absolute_rect().topleft)
+
+    def get_composed_surface(self) -> Optional[pygame.Surface]:
+        content = self._content_rect
+        size = (max(1, content.width), max(1, content.height))
+        if self._composed is None or self._composed.get_size() != size:
+            self._composed = pygame.Surface(size, pygame.SRCALPHA)
+            self._needs_compose = True
+
+        if self._needs_compose:
+            self.update_background()
+            self._compose_area(self._composed.get_rect())
+        else:
+            for child in self._dirty_children:
+                self._compose_area(child.get_extent().move(-content.x, -content.y))
+        self._needs_compose = False
+        self._dirty_children.clear()
+        return self._composed
+
+    def _compose_area(self, area: pygame.Rect):
+        """Заново накладывает фон и всех детей в пределах area"""
+        composed = self._composed
+        offset_x, offset_y = -self._content_rect.x, -self._content_rect.y
+        composed.set_clip(area)
+        composed.fill((0, 0, 0, 0))
+        if self.surface:
+            composed.blit(self.surface, (offset_x, offset_y))
+        for child in self.children:
+            child_surface = child.get_composed_surface()
+            if child_surface is not None:
+                extent = child.get_extent()
+                composed.blit(child_surface, (extent.x + offset_x, extent.y + offset_y))
+        composed.set_clip(None)
 
     def render(self, surface: pygame.Surface) -> None:
-        """Отрисовка layout'а и всех дочерних виджетов"""
-        self.update_background()
+        """Отрисовка layout'а и всех дочерних виджетов одной готовой поверхностью"""
+        self.ensure_layout()
+        composed = self.get_composed_surface()
+        surface.blit(composed, self.get_drawn_rect().topleft)
+
+    def collect_dirty_rects(self) -> List[pygame.Rect]:
+        self.ensure_layout()
+        rects = super().collect_dirty_rects()
+        for child in self.children:
+            rects.extend(child.collect_dirty_rects())
+        return rects
 
-        if self.surface:
-            surface.blit(self.surface, self.rect)
+    def invalidate_rect(self):
+        super().invalidate_rect()
+        for child in self.children:
+            child.invalidate_rect()
 
+    def iter_widgets(self):
+        """Все потомки в порядке отрисовки (последний рисуется поверх остальных)"""
         for child in self.children:
-            child.render(surface)
+            yield child
+            if isinstance(child, Layout):
+                yield from child.iter_widgets()
 
     def handle_event(self, event: pygame.event.Event) -> bool:
-        for child in self.children:
-            child.handle_event(event)
+        # Сверху вниз по порядку отрисовки, до первого виджета, обработавшего событие
+        for child in reversed(self.children):
+            if child.handle_event(event):
+                return True
+        return False
 
     def update(self, delta_time: float) -> None:
         for child in self.children:
@@ -68,7 +170,8 @@ class VerticalLayout(Layout):
 
         size = (size[0], y_offset)
         self.rect = pygame.Rect(self.pos, size)
-        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        if self.surface is None or self.surface.get_size() != size:
+            self.surface = pygame.Surface(size, pygame.SRCALPHA)
 
 
 
@@ -91,7 +194,8 @@ class HorizontalLayout(Layout):
 
         size = (x_offset, size[0])
         self.rect = pygame.Rect(self.pos, size)
-        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        if self.surface is None or self.surface.get_size() != size:
+            self.surface = pygame.Surface(size, pygame.SRCALPHA)
 
 
 class ScreenLayout(Layout):
@@ -1,7 +1,9 @@
 import enum
+from typing import Optional
 
 import pygame
 
+from widgets.text_layout import TextLayout
 from widgets.widget import Widget
 
 class TextAlignmentType(enum.Enum):
@@ -17,7 +19,8 @@ class TextLabel(Widget):
                  width:int =0, height: int =0,
                  font_size:int =25,
                  font_name='Times new roman',
-                 widget_name="Text label"):
+                 widget_name="Text label",
+                 paged: bool = False):
         super().__init__(widget_name)
         self.rect = pygame.Rect((x, y),(width, height))
 
@@ -26,54 +29,72 @@ class TextLabel(Widget):
         self.font_size = font_size
         self.color = (255, 255, 255)
 
-        self._text_blocks: list[str] = []
-        self._current_block = 0
+        # paged=True - текст делится на страницы высотой rect.height (диалоговые окна)
+        self.paged = paged
+        self.current_page = 0
 
-        self._font = None
-        self._rendered_lines: list[pygame.Surface] = []
+        self._layout: Optional[TextLayout] = None
         self.update_text()
 
     def update_text(self):
         """Обновляет внутренние данные текста и его отображение."""
-        self._font = pygame.font.SysFont(self.font_name, self.font_size)
-        self._wrap_text()
-
-    def _wrap_text(self):
-        """Разбивает текст на строки по ширине self.rect.width."""
-        self._rendered_lines.clear()
-        words = self.text.split(' ')
-        lines = []
-        current_line = ""
-
-        for word in words:
-            test_line = current_line + word + " "
-            if self._font.size(test_line)[0] <= self.rect.width:
-                current_line = test_line
-            else:
-                if current_line:
-                    lines.append(current_line[:-1])  # Убираем лишний пробел
-                current_line = word + " "
-
-        if current_line:
-            lines.append(current_line[:-1])
-
-        for line in lines:
-            self._rendered_lines.append(self._font.render(line, True, self.color))
+        page_height = self.rect.height if self.paged else None
+        layout = self._layout
+        if layout is None or (layout.font_name, layout.font_size) != (self.font_name, self.font_size):
+            self._layout = TextLayout(self.font_name, self.font_size, self.rect.width, self.color, page_height)
+        else:
+            layout.width = self.rect.width
+            layout.color = self.color
+            layout.page_height = page_height
+        self._layout.set_text(self.text)
+        self.current_page = 0
+        self.mark_dirty()
+
+    @property
+    def page_count(self) -> int:
+        return self._layout.page_count
 
     def set_text(self, text: str):
         self.text = text
-        self.update_text()
+        self._layout.set_text(text)
+        self.current_page = 0
+        self.mark_dirty()
+
+    def append_text(self, text: str):
+        """Дописывает текст; раскладка пересчитывается только с последней строки"""
+        self.text += text
+        self._layout.append(text)
+        self.mark_dirty()
 
     def set_color(self, color: tuple[int, int, int]):
         self.color = color
-        self.update_text()
+        self._layout.set_color(color)
+        self.mark_dirty()
+
+    def set_page(self, page: int):
+        page = max(0, min(page, self.page_count - 1))
+        if page != self.current_page:
+            self.current_page = page
+            self.mark_dirty()
+
+    def next_page(self) -> bool:
+        """Переходит на следующую страницу; False, если это была последняя"""
+        if self.current_page + 1 >= self.page_count:
+            return False
+        self.set_page(self.current_page + 1)
+        return True
+
+    def prev_page(self) -> bool:
+        if self.current_page == 0:
+            return False
+        self.set_page(self.current_page - 1)
+        return True
+
+    def get_composed_surface(self) -> Optional[pygame.Surface]:
+        return self._layout.get_page_surface(self.current_page)
 
     def render(self, screen: pygame.Surface):
-        y_offset = self.rect.y
-        print(len(self._rendered_lines))
-        for line_surface in self._rendered_lines:
-            screen.blit(line_surface, (self.rect.x, y_offset))
-            y_offset += self._font.get_height()  # Переходим на следующую строку
+        screen.blit(self.get_composed_surface(), self.rect.topleft)
 
     def handle_event(self, event: pygame.event.Event) -> bool:
         pass
@@ -0,0 +1,132 @@
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+
+from managers.mngfont import font_manager
+
+
+class TextLayout:
+    """
+    Раскладка текста по строкам заданной ширины с разбиением на страницы.
+    Ширина каждого слова измеряется один раз на шрифт (кэш общий, в font_manager),
+    при дописывании текста (append) перераскладывается только последняя строка.
+    Страница собирается из строк, отрисованных через font_manager, при первом запросе
+    и кэшируется до изменения текста или цвета.
+    """
+
+    def __init__(self, font_name: str, font_size: int, width: int,
+                 color: Tuple[int, int, int] = (255, 255, 255), page_height: Optional[int] = None):
+        self.font_name = font_name
+        self.font_size = font_size
+        self.font = font_manager.get_font(font_name, font_size)
+        self.width = width
+        self.color = color
+        # Высота страницы в пикселях; None - весь текст на одной странице
+        self.page_height = page_height
+
+        self.text = ""
+        self.lines: List[str] = []
+        self._line_starts: List[int] = []  # смещение начала строки в self.text
+
+        self._word_widths = font_manager.word_widths(font_name, font_size)
+        self._space_width = self.font.size(" ")[0]
+        self._pages: Dict[int, pygame.Surface] = {}
+
+    @property
+    def line_height(self) -> int:
+        return self.font.get_height()
+
+    @property
+    def lines_per_page(self) -> int:
+        if not self.page_height:
+            return max(1, len(self.lines))
+        return max(1, self.page_height // self.line_height)
+
+    @property
+    def page_count(self) -> int:
+        return max(1, -(-len(self.lines) // self.lines_per_page))
+
+    def set_text(self, text: str):
+        self.text = text
+        self.lines.clear()
+        self._line_starts.clear()
+        self._wrap_from(0)
+        self._pages.clear()
+
+    def append(self, text: str):
+        """Дописывает текст, перераскладывая только начиная с последней строки"""
+        if not self.lines:
+            self.set_text(self.text + text)
+            return
+        first_changed = len(self.lines) - 1
+        start = self._line_starts[first_changed]
+        del self.lines[first_changed:]
+        del self._line_starts[first_changed:]
+
+        self.text += text
+        self._wrap_from(start)
+        self._drop_pages_from(first_changed)
+
+    def set_color(self, color: Tuple[int, int, int]):
+        if tuple(color) != tuple(self.color):
+            self.color = color
+            self._pages.clear()
+
+    def set_width(self, width: int):
+        if width != self.width:
+            self.width = width
+            self.set_text(self.text)
+
+    def get_page_lines(self, page: int) -> List[str]:
+        per_page = self.lines_per_page
+        return self.lines[page * per_page:(page + 1) * per_page]
+
+    def get_page_surface(self, page: int = 0) -> pygame.Surface:
+        """Поверхность страницы со всеми её строками, собирается при первом запросе"""
+        surface = self._pages.get(page)
+        if surface is None:
+            lines = self.get_page_lines(page)
+            line_height = self.line_height
+            surface = pygame.Surface((max(1, self.width), max(1, line_height * len(lines))), pygame.SRCALPHA)
+            for i, line in enumerate(lines):
+                if line:
+                    surface.blit(font_manager.render_text(line, self.font_name, self.font_size, self.color),
+                                 (0, i * line_height))
+            self._pages[page] = surface
+        return surface
+
+    def _measure(self, word: str) -> int:
+        width = self._word_widths.get(word)
+        if width is None:
+            width = self.font.size(word)[0]
+            self._word_widths[word] = width
+        return width
+
+    def _wrap_from(self, start: int):
+        """Жадно раскладывает self.text[start:] по строкам; start - начало строки"""
+        offset = start
+        for paragraph in self.text[start:].split("\n"):
+            line_words: List[str] = []
+            line_start = offset
+            line_width = 0
+            word_offset = offset
+            for word in paragraph.split(" "):
+                # Ширина строки с завершающим пробелом, как у font.size(line + " ")
+                word_width = self._measure(word) + self._space_width
+                if line_words and line_width + word_width > self.width:
+                    self._add_line(line_start, line_words)
+                    line_words, line_start, line_width = [], word_offset, 0
+                line_words.append(word)
+                line_width += word_width
+                word_offset += len(word) + 1
+            self._add_line(line_start, line_words)
+            offset += len(paragraph) + 1
+
+    def _add_line(self, start: int, words: List[str]):
+        self.lines.append(" ".join(words))
+        self._line_starts.append(start)
+
+    def _drop_pages_from(self, line_index: int):
+        first_page = line_index // self.lines_per_page if self.page_height else 0
+        for page in [page for page in self._pages if page >= first_page]:
+            del self._pages[page]
@@ -1,10 +1,17 @@
 from abc import abstractmethod, ABC
-from typing import Optional, Tuple
+from typing import Dict, Hashable, List, Optional, Tuple
 
 import pygame
 
 
 class Widget(ABC):
+    # Виджет принимает события мыши через UIDispatcher (попадает в пространственный индекс)
+    interactive = False
+    # Проверять попадание по маске поверхности, а не только по прямоугольнику
+    use_mask = True
+    # Растёт при любом изменении геометрии виджетов, по нему UIDispatcher перестраивает индекс
+    layout_version = 0
+
     def __init__(self, name: str = ""):
         self.name = name
         self.rect = pygame.Rect(0, 0, 0, 0)
@@ -15,6 +22,15 @@ class Widget(ABC):
         self.border_color: Optional[Tuple[int, int, int, int]] = None
         self.border_width: int = 0
 
+        # Виджет изменился с последней отрисовки (для режима грязных прямоугольников)
+        self.dirty = True
+        self._drawn_rect: Optional[pygame.Rect] = None
+
+        # Кэш абсолютного прямоугольника и масок поверхности по состояниям (см. surface_state)
+        self._absolute_rect: Optional[pygame.Rect] = None
+        self._masks: Dict[Hashable, pygame.mask.Mask] = {}
+        self.surface_state: Hashable = None
+
     @abstractmethod
     def render(self, surface: pygame.Surface) -> None:
         """Отрисовка виджета"""
@@ -30,22 +46,85 @@ class Widget(ABC):
         """Обновление состояния виджета"""
         pass
 
-    def get_absolute_rect(self) -> pygame.Rect:
-        if self.parent:
-            parent_rect = self.parent.get_absolute_rect()
-            x = parent_rect.x + self.rect.x
-            y = parent_rect.y + self.rect.y
+    def mark_dirty(self):
+        """Вид виджета изменился: родитель перекомпонует его область при следующей отрисовке"""
+        self.dirty = True
+        if self.parent is not None:
+            self.parent.child_changed(self)
+
+    def get_composed_surface(self) -> Optional[pygame.Surface]:
+        """Готовое изображение виджета в его координатах, которое родитель накладывает на свою поверхность"""
+        return self.surface
+
+    def get_extent(self) -> pygame.Rect:
+        """Область, которую занимает изображение виджета, в координатах родителя"""
+        return self.rect
+
+    def get_drawn_rect(self) -> pygame.Rect:
+        """Область на экране, которую занимает изображение виджета"""
+        return self.get_absolute_rect()
+
+    def collect_dirty_rects(self) -> List[pygame.Rect]:
+        """Экранные области, изменившиеся с прошлого вызова: новое и прежнее место виджета"""
+        if not self.dirty:
+            return []
+        self.dirty = False
+        rect = self.get_drawn_rect()
+        rects = [rect]
+        if self._drawn_rect and self._drawn_rect != rect:
+            rects.append(self._drawn_rect)
+        self._drawn_rect = rect
+        return rects
+
+    def on_mouse_leave(self):
+        """Курсор ушёл с виджета (вызывает UIDispatcher)"""
+        pass
 
-            return pygame.Rect((x, y), self.rect.size)
-        else:
-            return self.rect.copy()
+    def get_absolute_rect(self) -> pygame.Rect:
+        """
+        Прямоугольник на экране. Кэшируется до invalidate_rect(); возвращаемый Rect
+        общий, изменять его нельзя.
+        """
+        if self._absolute_rect is None:
+            if self.parent:
+                parent_rect = self.parent.get_absolute_rect()
+                self._absolute_rect = pygame.Rect((parent_rect.x + self.rect.x, parent_rect.y + self.rect.y),
+                                                  self.rect.size)
+            else:
+                self._absolute_rect = self.rect.copy()
+        return self._absolute_rect
+
+    def invalidate_rect(self):
+        """Сбрасывает кэш абсолютного прямоугольника. Вызывать после изменения rect или родителя"""
+        self._absolute_rect = None
+        Widget.layout_version += 1
+
+    def invalidate_masks(self):
+        """Сбрасывает маски. Вызывать, если поверхность пересоздана или её содержимое в состоянии изменилось"""
+        self._masks.clear()
+
+    def get_mask(self) -> pygame.mask.Mask:
+        """Маска поверхности для текущего surface_state, строится один раз на состояние"""
+        mask = self._masks.get(self.surface_state)
+        if mask is None:
+            mask = pygame.mask.from_surface(self.surface)
+            self._masks[self.surface_state] = mask
+        return mask
 
     def collide_to_point(self, point: Tuple[int, int]) -> bool:
         return self.get_absolute_rect().collidepoint(point)
 
     def collide_point_with_mask(self, point: Tuple[int, int]):
-        mask = pygame.mask.from_surface(self.surface)
-        return mask.get_at((point[0] - self.get_absolute_rect().x, point[1] - self.get_absolute_rect().y))
+        rect = self.get_absolute_rect()
+        return self.get_mask().get_at((point[0] - rect.x, point[1] - rect.y))
+
+    def hit_test(self, point: Tuple[int, int]) -> bool:
+        """Точное попадание точки в виджет: прямоугольник и, если use_mask, маска"""
+        if not self.collide_to_point(point):
+            return False
+        if self.use_mask and self.surface is not None:
+            return bool(self.collide_point_with_mask(point))
+        return True
 
     def update_background(self):
         if self.surface is None: